@@ -15,5 +15,8 @@ setup(
         "lxml",
         "cssselect",
         "pymysql",
-    ]
+    ],
+    extras_require={
+        "aio": ["aiohttp"],
+    }
 )
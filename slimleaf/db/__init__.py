@@ -1,7 +1,18 @@
 from .db import (  # noqa
     get_mysql_connection,
+    get_mysql_pool,
+    close_mysql_pools,
     cassandra_connection,
+    close_cassandra_sessions,
+    cassandra_query,
+    cassandra_execute_concurrent,
+    prepared_statement,
     get_sqlite3_conx,
     query_result,
-    update_db
+    stream_query,
+    update_db,
+    bulk_update_db,
+    ChunkResult,
 )
+from .cache import QUERY_CACHE, QueryCache  # noqa
+from .pool import ConnectionPool  # noqa
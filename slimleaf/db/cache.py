@@ -0,0 +1,119 @@
+from collections import OrderedDict
+from threading import Lock
+import time
+import weakref
+
+
+class QueryCache(object):
+    """Size-bounded LRU of query results that expire after a time-to-live
+
+    Intended for read-only reference data (country codes, feature flags, plan IDs) that tests look
+    up with identical SQL and arguments many times per run. Entries are keyed on the identity of
+    the connection or pool the query ran against, and every entry for a connection is dropped when
+    `update_db` writes through that same connection or pool.
+
+    Connections that support weak references are keyed by id, and their entries are dropped when
+    they are garbage collected. Others (e.g. sqlite3 connections) are keyed by the connection
+    itself, so a cached entry keeps its connection object alive until the entry expires or is
+    evicted, and its id can never be reused by another connection meanwhile.
+
+    Args:
+        maxsize (int): Maximum number of results held; least recently used are evicted first
+        ttl (float): Seconds a result may be served after it was fetched
+
+    Attributes:
+        hits (int): Number of lookups served from the cache
+        misses (int): Number of lookups that had to query the database
+    """
+
+    def __init__(self, maxsize=256, ttl=300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (expiry, result)
+        self._watched = set()
+        self._lock = Lock()
+
+    def get(self, key):
+        """Return (True, result) for a live entry, otherwise (False, None)"""
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, entry[1]
+
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def set(self, key, result):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, cxn=None):
+        """Drop every entry for a connection or pool, or every entry if none is given"""
+
+        with self._lock:
+            if cxn is None:
+                self._entries.clear()
+            else:
+                self._drop_identity(id(cxn) if id(cxn) in self._watched else cxn)
+        return None
+
+    def _drop_identity(self, identity):
+        for key in [key for key in self._entries if key[0] == identity]:
+            del self._entries[key]
+
+    def key(self, cxn, qry, args, *options):
+        """Cache key for a query: connection identity, SQL, normalized arguments and options"""
+
+        return (self._identity(cxn), qry, _normalized(args)) + options
+
+    def _identity(self, cxn):
+        """id of a weakly referenceable connection, watched so its entries are forgotten once it is
+        garbage collected; otherwise the connection itself, pinned alive by the entries keyed on it
+        """
+
+        cxn_id = id(cxn)
+        with self._lock:
+            if cxn_id in self._watched:
+                return cxn_id
+        try:
+            weakref.finalize(cxn, self._forget, cxn_id)
+        except TypeError:
+            return cxn  # e.g. sqlite3 connections, which do not support weak references
+        with self._lock:
+            self._watched.add(cxn_id)
+        return cxn_id
+
+    def _forget(self, cxn_id):
+        with self._lock:
+            self._watched.discard(cxn_id)
+            self._drop_identity(cxn_id)
+
+    @property
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries)}
+
+
+def _normalized(args):
+    """Hashable, order-insensitive (for mappings) form of query arguments"""
+
+    if isinstance(args, dict):
+        return tuple(sorted((name, _normalized(value)) for name, value in args.items()))
+    elif isinstance(args, (list, tuple, set, frozenset)):
+        normalized = tuple(_normalized(value) for value in args)
+        if isinstance(args, (set, frozenset)):
+            normalized = tuple(sorted(normalized, key=repr))
+        return normalized
+    return args
+
+
+QUERY_CACHE = QueryCache()
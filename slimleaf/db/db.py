@@ -1,16 +1,28 @@
-from sqlite3 import connect as sqlite_connect
+from collections import namedtuple
+from contextlib import contextmanager
+from copy import copy
+from sqlite3 import Connection as SQLiteConnection, Error as SQLiteError, connect as sqlite_connect
+from threading import Lock
+from weakref import WeakKeyDictionary
 import ssl
 
 from cassandra.cluster import Cluster
+from cassandra.concurrent import execute_concurrent_with_args
 from cassandra.auth import PlainTextAuthProvider
 from cassandra.policies import WhiteListRoundRobinPolicy
 from pymysql import connect, MySQLError
+from pymysql.connections import Connection as MySQLConnection
+from pymysql.cursors import RE_INSERT_VALUES, SSCursor
 
-from slimleaf.exceptions import EMPTY_QUERY_MSG, SlimleafException
+from slimleaf.db.cache import QUERY_CACHE
+from slimleaf.db.pool import ConnectionPool
+from slimleaf.exceptions import SlimleafException
 
 
 EMPTY_QUERY_MSG = "Expected results but query was empty"
 
+ChunkResult = namedtuple('ChunkResult', ['row_count', 'last_row_id'])
+
 
 # MySQL
 def get_mysql_connection(cxn_data):
@@ -30,6 +42,46 @@ def get_mysql_connection(cxn_data):
         db=cxn_data['database'])
 
 
+_mysql_pools = {}
+_mysql_pools_lock = Lock()
+
+
+def get_mysql_pool(cxn_data, **kwargs):
+    """Retrieve the shared pool of pymysql connections for a set of connection information
+
+    One pool exists per distinct `cxn_data` for the life of the process, so fixtures can ask for a
+    pool per test without opening a connection per test.
+
+    Args:
+        cxn_data (dict): map of connection information: host, rw-user, rw-password, database
+        kwargs: Passed through to slimleaf.db.pool.ConnectionPool when the pool is first created
+
+    Returns:
+        slimleaf.db.pool.ConnectionPool
+    """
+
+    key = tuple(sorted(cxn_data.items()))
+    with _mysql_pools_lock:
+        pool = _mysql_pools.get(key)
+        if pool is None:
+            cxn_data = dict(cxn_data)
+            pool = _mysql_pools[key] = ConnectionPool(
+                lambda: get_mysql_connection(cxn_data), **kwargs
+            )
+    return pool
+
+
+def close_mysql_pools():
+    """Close and forget every shared MySQL pool, e.g. at the end of a test session"""
+
+    with _mysql_pools_lock:
+        pools = list(_mysql_pools.values())
+        _mysql_pools.clear()
+    for pool in pools:
+        pool.close()
+    return None
+
+
 # SQLite3
 def get_sqlite3_conx(db_name):
     """Get SQLite3 connection for communicating with the local DB"""
@@ -38,7 +90,54 @@ def get_sqlite3_conx(db_name):
 
 
 # Cassandra
-def cassandra_connection(user, pw, cluster_host, key, cert_path=None):
+_cassandra_sessions = {}
+_cassandra_sessions_lock = Lock()
+_prepared_statements = WeakKeyDictionary()
+_prepared_statements_lock = Lock()
+
+
+def cassandra_connection(user, pw, cluster_host, key, cert_path=None, cached=True):
+    """Retrieve a Cassandra session connected to a keyspace
+
+    Building a Cluster performs full topology discovery and opens new connection pools, so by
+    default one session is kept per host, user and keyspace and reused for the life of the process.
+
+    Args:
+        user (str): Cassandra username
+        pw (str): Cassandra password
+        cluster_host (str): Contact point for the cluster
+        key (str): Keyspace to connect to
+        cert_path (str): CA certificate, if the cluster requires SSL
+        cached (bool): Whether to reuse (and register) the shared session for these arguments
+
+    Returns:
+        cassandra.cluster.Session
+    """
+
+    if not cached:
+        return _new_cassandra_session(user, pw, cluster_host, key, cert_path)
+
+    registry_key = (cluster_host, user, key, cert_path)
+    with _cassandra_sessions_lock:
+        session = _cassandra_sessions.get(registry_key)
+        if session is None or session.is_shutdown:
+            session = _new_cassandra_session(user, pw, cluster_host, key, cert_path)
+            _cassandra_sessions[registry_key] = session
+    return session
+
+
+def close_cassandra_sessions():
+    """Shut down every shared Cassandra cluster, e.g. at the end of a test session"""
+
+    with _cassandra_sessions_lock:
+        sessions = list(_cassandra_sessions.values())
+        _cassandra_sessions.clear()
+    for session in sessions:
+        session.cluster.shutdown()
+    return None
+
+
+def _new_cassandra_session(user, pw, cluster_host, key, cert_path=None):
 
     use_ssl = True if cert_path else False
 
@@ -73,17 +172,102 @@ def cassandra_connection(user, pw, cluster_host, key, cert_path=None):
     return session
 
 
-def query_result(cxn, qry, args=None, single_row=False, all_fields=True, empty_results=False):
+def prepared_statement(session, qry):
+    """Prepare a CQL query once per session, returning the cached statement on later calls"""
+
+    with _prepared_statements_lock:
+        statements = _prepared_statements.setdefault(session, {})
+        statement = statements.get(qry)
+    if statement is None:
+        statement = session.prepare(qry)
+        with _prepared_statements_lock:
+            statement = statements.setdefault(qry, statement)
+    return statement
+
+
+def cassandra_query(session, qry, args=None, fetch_size=5000):
+    """Executes a CQL query as a cached prepared statement, yielding rows page by page.
+
+    Only one page of `fetch_size` rows is held in memory at a time; the next page is requested
+    from the cluster as iteration reaches the end of the current one.
+
+    Args:
+        session (cassandra.cluster.Session)
+        qry (str): Valid CQL query, with `?` placeholders
+        args (list): Values bound to the placeholders
+        fetch_size (int): Number of rows per page
+
+    Yields:
+        row (named tuple, or as configured by the session's row_factory)
+    """
+
+    statement = prepared_statement(session, qry).bind(args or [])
+    statement.fetch_size = fetch_size
+    for row in session.execute(statement):
+        yield row
+
+
+def cassandra_execute_concurrent(session, qry, args_list, concurrency=50):
+    """Executes a CQL query once per set of arguments, with many statements in flight at once.
+
+    Args:
+        session (cassandra.cluster.Session)
+        qry (str): Valid CQL query, with `?` placeholders
+        args_list (iterable): Values bound to the placeholders, one entry per execution
+        concurrency (int): Maximum number of statements in flight at a time
+
+    Returns:
+        results (list): Result of each execution, in the order of `args_list`
+
+    Raises:
+        SlimleafException: listing every execution that failed, once all have completed
+    """
+
+    args_list = list(args_list)
+    outcomes = execute_concurrent_with_args(
+        session, prepared_statement(session, qry), args_list, concurrency=concurrency,
+        raise_on_first_error=False
+    )
+
+    failures = [
+        f'{args}: {result!r}' for args, (success, result) in zip(args_list, outcomes) if not success
+    ]
+    if failures:
+        raise SlimleafException(
+            f'{len(failures)} of {len(args_list)} executions failed for query {qry}:\n'
+            + '\n'.join(failures)
+        )
+    return [result for _, result in outcomes]
+
+
+@contextmanager
+def _checked_out(cxn):
+    """Yield a usable connection from either a connection or a ConnectionPool"""
+
+    if isinstance(cxn, ConnectionPool):
+        with cxn.connection() as pooled_cxn:
+            yield pooled_cxn
+    else:
+        yield cxn
+
+
+def query_result(cxn, qry, args=None, single_row=False, all_fields=True, empty_results=False,
+                 cached=False):
     """Executes a READ-only query against the database (does not COMMIT changes).
 
+    With `cached`, results are memoized in slimleaf.db.cache.QUERY_CACHE (a TTL-bounded LRU) and
+    identical queries against the same connection or pool are answered without a round trip until
+    the entry expires or `update_db` writes through that connection or pool.
+
     Args:
-        cxn (DB-API 2.0 compliant DB connection)
+        cxn (DB-API 2.0 compliant DB connection, or slimleaf.db.pool.ConnectionPool)
         qry (str): Valid SQL query
         args (dict): (MySQL) Map of names to interpolated values to be substituted during query
              (list): (SQLite3) collection of values to be interpolated into query
         single_row (bool): Whether or not to limit results to the first row
         all_fields (bool): Whether or not to include all fields or only the first
         empty_results (bool): Whether or not empty results are acceptable (raises Exception if not)
+        cached (bool): Whether or not to serve and store the result in QUERY_CACHE
 
     Returns:
         result (list) if all_fields is True
@@ -91,23 +275,97 @@ def query_result(cxn, qry, args=None, single_row=False, all_fields=True, empty_r
 
     """
     args = args or []
-    curs = cxn.cursor()
-    curs.execute(qry, args)
-    if single_row:
-        result = curs.fetchone()
+    if cached:
+        key = QUERY_CACHE.key(cxn, qry, args, single_row, all_fields)
+        found, result = QUERY_CACHE.get(key)
+    if not cached or not found:
+        with _checked_out(cxn) as conn:
+            curs = conn.cursor()
+            curs.execute(qry, args)
+            if single_row:
+                result = curs.fetchone()
+            else:
+                result = curs.fetchall()
+        if cached:
+            QUERY_CACHE.set(key, copy(result))
     else:
-        result = curs.fetchall()
-    if not result and not empty_results:
+        result = copy(result)
+
+    if not result and not empty_results:  # Checked on cache hits too: callers may disagree
         raise SlimleafException(EMPTY_QUERY_MSG)
     else:
-        return result if all_fields else result[0]
+        result = result if all_fields else result[0]
+        return result
+
+
+def stream_query(cxn, qry, args=None, batch_size=1000, batches=False, empty_results=False,
+                 abandon=None):
+    """Executes a READ-only query and yields results as they arrive, in constant memory.
+
+    MySQL results are read through an unbuffered server-side cursor (SSCursor); other connections,
+    e.g. SQLite3, are read with `fetchmany`. Nothing is executed until iteration begins.
+
+    Stopping early (breaking out of the loop or closing the generator) on MySQL leaves unread rows
+    on the wire, which the protocol offers two ways to deal with, chosen by `abandon`:
+    'close' closes the connection, which is immediate; 'drain' reads and discards the remaining
+    rows, which keeps the connection usable but takes as long as reading them would. By default a
+    connection from a ConnectionPool is closed (the pool replaces it) and one passed in directly is
+    drained, so the caller's connection is never closed behind its back.
+
+    Args:
+        cxn (DB-API 2.0 compliant DB connection, or slimleaf.db.pool.ConnectionPool)
+        qry (str): Valid SQL query
+        args (dict): (MySQL) Map of names to interpolated values to be substituted during query
+             (list): (SQLite3) collection of values to be interpolated into query
+        batch_size (int): Number of rows fetched from the cursor at a time
+        batches (bool): Whether to yield lists of up to `batch_size` rows rather than single rows
+        empty_results (bool): Whether or not empty results are acceptable (raises Exception if not)
+        abandon (str): (MySQL) 'close' or 'drain' an unbuffered result left partly read; None
+            closes pooled connections and drains others
+
+    Yields:
+        row (tuple), or batch (list) if batches is True
+    """
+
+    if abandon not in (None, 'close', 'drain'):
+        raise SlimleafException(f"abandon must be 'close' or 'drain', not {abandon!r}")
+    if abandon is None:
+        abandon = 'close' if isinstance(cxn, ConnectionPool) else 'drain'
+
+    args = args or []
+    with _checked_out(cxn) as conn:
+        unbuffered = isinstance(conn, MySQLConnection)
+        curs = conn.cursor(SSCursor) if unbuffered else conn.cursor()
+        streaming = False  # Whether an unbuffered result is partly read
+        exhausted = False
+        try:
+            curs.execute(qry, args)
+            streaming = unbuffered
+            batch = curs.fetchmany(batch_size)
+            if not batch:
+                exhausted = True
+                if not empty_results:
+                    raise SlimleafException(EMPTY_QUERY_MSG)
+
+            while batch:
+                if batches:
+                    yield batch
+                else:
+                    yield from batch
+                batch = curs.fetchmany(batch_size)
+            exhausted = True
+        finally:
+            if streaming and not exhausted and abandon == 'close':
+                conn.close()  # Abandons the result; a pool discards the closed connection
+            else:
+                curs.close()  # Drains any unread rows of an unbuffered result
 
 
 def update_db(cxn, qry, args=None):
     """Executes a WRITE query against the database, including a COMMIT.
 
     Args:
-        cxn (DB-API 2.0 compliant DB connection)
+        cxn (DB-API 2.0 compliant DB connection, or slimleaf.db.pool.ConnectionPool)
         qry (str): Valid SQL query
         args (dict): (MySQL) Map of names to interpolated values to be substituted during query
              (list): (SQLite3) collection of values to be interpolated into query
@@ -115,10 +373,91 @@ def update_db(cxn, qry, args=None):
         last_row_id (cursor.lastrowid): ID of row just inserted
     """
     args = args or []
-    curs = cxn.cursor()
     try:
-        curs.execute(qry, args)
-        cxn.commit()
-        return curs.lastrowid
+        with _checked_out(cxn) as conn:
+            curs = conn.cursor()
+            curs.execute(qry, args)
+            conn.commit()
+            return curs.lastrowid
     except MySQLError as e:
         raise SlimleafException(f'Update was unsuccessful') from e
+    finally:
+        QUERY_CACHE.invalidate(cxn)
+
+
+def bulk_update_db(cxn, qry, rows, chunk_size=1000, multi_row=False):
+    """Executes a WRITE query for many rows of arguments, committing once per chunk.
+
+    Each chunk is sent with `executemany` and committed as its own transaction; if a chunk fails,
+    it is rolled back and earlier chunks remain committed.
+
+    Args:
+        cxn (DB-API 2.0 compliant DB connection, or slimleaf.db.pool.ConnectionPool)
+        qry (str): Valid SQL query, written for a single row of arguments
+        rows (iterable): Arguments for each row - dicts (MySQL) or sequences (MySQL, SQLite3)
+        chunk_size (int): Number of rows per transaction
+        multi_row (bool): (MySQL) Rewrite `INSERT ... VALUES (...)` into a single multi-row
+            `INSERT ... VALUES (...), (...)` statement per chunk
+
+    Returns:
+        results (list): ChunkResult(row_count, last_row_id) for each chunk. For multi-row MySQL
+            inserts, last_row_id is the ID of the chunk's first row; for SQLite3 it is the
+            connection's `last_insert_rowid()` after the chunk.
+
+    Raises:
+        SlimleafException: if chunk_size is less than 1, or a chunk fails
+    """
+
+    if chunk_size < 1:
+        raise SlimleafException(f'chunk_size must be at least 1, got {chunk_size}')
+    try:
+        return _bulk_update(cxn, qry, rows, chunk_size, multi_row)
+    finally:
+        QUERY_CACHE.invalidate(cxn)
+
+
+def _bulk_update(cxn, qry, rows, chunk_size, multi_row):
+    results = []
+    with _checked_out(cxn) as conn:
+        if multi_row:
+            match = RE_INSERT_VALUES.match(qry)
+            if not isinstance(conn, MySQLConnection) or not match:
+                raise SlimleafException(
+                    'Multi-row rewriting is only supported for MySQL INSERT ... VALUES queries'
+                )
+
+        for start, chunk in _chunked(rows, chunk_size):
+            curs = conn.cursor()
+            try:
+                if multi_row:
+                    prefix, values, postfix = match.groups()
+                    rows_sql = ','.join(curs.mogrify(values, row) for row in chunk)
+                    curs.execute(f'{prefix}{rows_sql}{postfix}')
+                else:
+                    curs.executemany(qry, chunk)
+                conn.commit()
+            except (MySQLError, SQLiteError) as e:
+                conn.rollback()
+                raise SlimleafException(
+                    f'Bulk update was unsuccessful for rows {start}-{start + len(chunk) - 1}'
+                ) from e
+            last_row_id = curs.lastrowid
+            if isinstance(conn, SQLiteConnection):  # executemany leaves lastrowid untouched
+                last_row_id = conn.execute('SELECT last_insert_rowid()').fetchone()[0]
+            results.append(ChunkResult(curs.rowcount, last_row_id))
+    return results
+
+
+def _chunked(rows, chunk_size):
+    """Yield (index of first row, list of rows) for consecutive chunks of an iterable"""
+
+    chunk = []
+    start = 0
+    for index, row in enumerate(rows):
+        chunk.append(row)
+        if len(chunk) == chunk_size:
+            yield start, chunk
+            chunk = []
+            start = index + 1
+    if chunk:
+        yield start, chunk
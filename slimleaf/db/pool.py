@@ -0,0 +1,172 @@
+from collections import deque
+from contextlib import contextmanager
+from threading import Condition
+import time
+
+from slimleaf.exceptions import SlimleafException
+
+
+def ping(cxn):
+    """Default health check: ping the server without reconnecting, if the connection supports it"""
+
+    if hasattr(cxn, 'ping'):
+        cxn.ping(reconnect=False)
+    return True
+
+
+class ConnectionPool(object):
+    """Thread-safe, size-bounded pool of DB-API 2.0 connections
+
+    Connections are created on demand up to `max_size`, health-checked when checked out, and
+    closed once they have sat idle for longer than `max_idle` seconds. Prefer the `connection()`
+    context manager, which always returns the connection to the pool.
+
+    Args:
+        factory (callable): Creates a new connection, e.g. `lambda: get_mysql_connection(data)`
+        max_size (int): Maximum number of connections open at once, idle or checked out
+        max_idle (float): Seconds an idle connection is kept before it is closed
+        health_check (callable): Called with a connection on checkout; a falsy result or an
+            exception causes the connection to be replaced
+        timeout (float): Seconds to wait for a free connection before raising
+    """
+
+    def __init__(self, factory, max_size=8, max_idle=300, health_check=ping, timeout=30):
+        self.factory = factory
+        self.max_size = max_size
+        self.max_idle = max_idle
+        self.health_check = health_check
+        self.timeout = timeout
+        self._idle = deque()  # (connection, time returned to the pool)
+        self._open = 0
+        self._closed = False
+        self._cond = Condition()
+
+    @property
+    def size(self):
+        """Number of connections currently open, idle or checked out"""
+
+        return self._open
+
+    @property
+    def idle(self):
+        """Number of open connections waiting in the pool"""
+
+        return len(self._idle)
+
+    def acquire(self):
+        """Check out a healthy connection, creating one if the pool is not yet full
+
+        Raises:
+            SlimleafException: if the pool is closed, or no connection frees up within `timeout`
+        """
+
+        deadline = time.monotonic() + self.timeout
+        while True:
+            with self._cond:
+                if self._closed:
+                    raise SlimleafException('Connection pool is closed')
+                self._evict_idle()
+
+                if self._idle:
+                    cxn, _ = self._idle.pop()  # Most recently used is least likely to have expired
+                elif self._open < self.max_size:
+                    self._open += 1
+                    cxn = None
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise SlimleafException(
+                            f'No connection became available within {self.timeout}s '
+                            f'(pool size {self.max_size})'
+                        )
+                    self._cond.wait(remaining)
+                    continue
+
+            if cxn is None:
+                try:
+                    return self.factory()
+                except Exception:
+                    self._forget()
+                    raise
+
+            if self._is_healthy(cxn):
+                return cxn
+            self.discard(cxn)
+
+    def release(self, cxn):
+        """Return a checked-out connection to the pool
+
+        Any open transaction is rolled back first, so the next checkout neither inherits
+        uncommitted work nor reads from a stale REPEATABLE READ snapshot. A connection that cannot
+        be rolled back is discarded instead.
+        """
+
+        try:
+            cxn.rollback()
+        except Exception:
+            self.discard(cxn)
+            return
+
+        with self._cond:
+            if self._closed:
+                self._open -= 1
+                _close_quietly(cxn)
+            else:
+                self._idle.append((cxn, time.monotonic()))
+            self._cond.notify()
+
+    def discard(self, cxn):
+        """Close a checked-out connection instead of returning it, freeing its slot in the pool"""
+
+        _close_quietly(cxn)
+        self._forget()
+
+    @contextmanager
+    def connection(self):
+        """Context manager checking a connection out of the pool and returning it afterward
+
+        The connection is always rolled back on its way back into the pool (see `release`), so
+        commit any writes inside the block.
+        """
+
+        cxn = self.acquire()
+        try:
+            yield cxn
+        finally:
+            self.release(cxn)
+
+    def close(self):
+        """Close every idle connection; checked-out connections are closed when released"""
+
+        with self._cond:
+            self._closed = True
+            while self._idle:
+                cxn, _ = self._idle.popleft()
+                self._open -= 1
+                _close_quietly(cxn)
+            self._cond.notify_all()
+
+    def _evict_idle(self):
+        expiry = time.monotonic() - self.max_idle
+        while self._idle and self._idle[0][1] < expiry:
+            cxn, _ = self._idle.popleft()
+            self._open -= 1
+            _close_quietly(cxn)
+
+    def _is_healthy(self, cxn):
+        try:
+            return bool(self.health_check(cxn))
+        except Exception:
+            return False
+
+    def _forget(self):
+        with self._cond:
+            self._open -= 1
+            self._cond.notify()
+
+
+def _close_quietly(cxn):
+    try:
+        cxn.close()
+    except Exception:
+        pass
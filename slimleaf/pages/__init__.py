@@ -1,3 +1,6 @@
 from .mobile import MobilePage  # noqa
 from .web import WebPage  # noqa
-from .page import Page  # noqa
+from .page import Page, detect_current_page  # noqa
+from .driver_pool import DriverPool  # noqa
+from .snapshot_page import SnapshotPage  # noqa
+from .fields import ElementField  # noqa
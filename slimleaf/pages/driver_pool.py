@@ -0,0 +1,226 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import logging
+from threading import Condition
+import time
+
+from selenium.common.exceptions import WebDriverException
+
+from slimleaf.exceptions import SlimleafException
+from slimleaf.pages.web.web_page import close_window
+from slimleaf.webdriver.snapshot import invalidate_snapshot
+
+# Storage access throws a SecurityError on data: and about:blank pages, e.g. Chrome's start page
+CLEAR_STORAGE_JS = """
+try { window.localStorage.clear(); } catch (e) {}
+try { window.sessionStorage.clear(); } catch (e) {}
+"""
+
+logger = logging.getLogger(__name__)
+
+
+def driver_alive(driver):
+    """Default health check: one round trip to the browser, which raises if the session is gone"""
+
+    return driver.current_window_handle is not None
+
+
+def reset_driver(driver):
+    """Return a web driver to a clean state: extra windows closed, cookies and storage cleared"""
+
+    handles = list(driver.window_handles)
+    for handle in reversed(handles[1:]):
+        driver.switch_to.window(handle)
+        close_window(driver)
+    driver.switch_to.window(handles[0])
+    driver.delete_all_cookies()
+    try:
+        driver.execute_script(CLEAR_STORAGE_JS)
+    except WebDriverException:
+        pass  # Nothing to clear where scripts cannot run; not worth restarting the browser over
+    invalidate_snapshot(driver)
+    return None
+
+
+class DriverPool(object):
+    """Thread-safe pool of pre-warmed WebDriver sessions, leased out to pages one test at a time
+
+    Starting a browser takes seconds, so `size` sessions are started in parallel up front and reused.
+    Between leases each driver is `reset`; a driver that fails its reset or its `health_check`, or
+    that has served `max_leases` leases, is quit and replaced with a fresh one.
+
+    Args:
+        factory (callable): Creates a new driver, e.g. `lambda: webdriver.Chrome(options=opts)`
+        size (int): Number of drivers kept running
+        max_leases (int): Leases served by a driver before it is recycled; None never recycles
+        health_check (callable): Called with a driver on checkout; a falsy result or an exception
+            causes the driver to be replaced
+        reset (callable): Called with a driver when it is returned. The default suits web drivers;
+            pass None (or a custom function) for native mobile sessions.
+        timeout (float): Seconds to wait for a free driver before raising
+    """
+
+    def __init__(self, factory, size=4, max_leases=50, health_check=driver_alive,
+                 reset=reset_driver, timeout=300):
+        self.factory = factory
+        self.max_leases = max_leases
+        self.health_check = health_check
+        self.reset = reset
+        self.timeout = timeout
+        self._leases = {}  # driver -> leases served
+        self._vacant = 0  # Slots whose replacement driver failed to start
+        self._closed = False
+        self._cond = Condition()
+
+        with ThreadPoolExecutor(max_workers=size) as executor:
+            futures = [executor.submit(factory) for _ in range(size)]
+        drivers = [future.result() for future in futures if future.exception() is None]
+        errors = [future.exception() for future in futures if future.exception() is not None]
+        if errors:
+            for driver in drivers:
+                _quit_quietly(driver)
+            raise SlimleafException(
+                f'Could not start {len(errors)} of {size} pooled drivers: {errors[0]!r}'
+            )
+        self._idle = deque(drivers)
+        self._leases.update((driver, 0) for driver in drivers)
+
+    @property
+    def size(self):
+        """Number of drivers currently running, idle or leased"""
+
+        return len(self._leases)
+
+    @property
+    def idle(self):
+        """Number of drivers waiting in the pool"""
+
+        return len(self._idle)
+
+    def acquire(self):
+        """Check out a healthy driver, waiting for one to be released if all are leased
+
+        If a replacement driver failed to start earlier, a new one is started here rather than
+        waiting for a release that will never come.
+
+        Raises:
+            SlimleafException: if the pool is closed, no driver frees up within `timeout`, or a
+                needed replacement driver cannot be started
+        """
+
+        deadline = time.monotonic() + self.timeout
+        driver = None
+        with self._cond:
+            while not self._idle:
+                if self._closed:
+                    raise SlimleafException('Driver pool is closed')
+                if self._vacant:
+                    self._vacant -= 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise SlimleafException(
+                        f'No driver became available within {self.timeout}s '
+                        f'(pool size {self.size})'
+                    )
+                self._cond.wait(remaining)
+            else:
+                if self._closed:
+                    raise SlimleafException('Driver pool is closed')
+                driver = self._idle.popleft()
+
+        if driver is None:
+            driver = self._start()
+        elif not self._is_healthy(driver):
+            driver = self._recycle(driver)
+        self._leases[driver] += 1
+        return driver
+
+    def release(self, driver):
+        """Reset a leased driver and return it to the pool, recycling it if it is worn out
+
+        Never raises: if a replacement cannot be started, the failure is logged and the slot is
+        refilled by a later `acquire`, so an exception from the leasing block is not masked.
+        """
+
+        worn_out = self.max_leases is not None and self._leases[driver] >= self.max_leases
+        if not worn_out and self.reset is not None:
+            try:
+                self.reset(driver)
+            except Exception:
+                worn_out = True
+        if worn_out and not self._closed:
+            try:
+                driver = self._recycle(driver)
+            except SlimleafException as e:
+                logger.warning('Driver pool slot left empty: %s', e)
+                return
+
+        with self._cond:
+            if self._closed:
+                self._leases.pop(driver, None)
+                _quit_quietly(driver)
+            else:
+                self._idle.append(driver)
+            self._cond.notify()
+
+    @contextmanager
+    def lease(self, page_class=None, *args, **kwargs):
+        """Context manager leasing a driver, returning it to the pool afterward
+
+        Args:
+            page_class (type): If given, a page built as `page_class(*args, driver=driver, **kwargs)`
+                is yielded instead of the bare driver, e.g. `pool.lease(LoginPage, base_url)`
+        """
+
+        driver = self.acquire()
+        try:
+            yield driver if page_class is None else page_class(*args, driver=driver, **kwargs)
+        finally:
+            self.release(driver)
+
+    def close(self):
+        """Quit every idle driver; leased drivers are quit when released"""
+
+        with self._cond:
+            self._closed = True
+            while self._idle:
+                driver = self._idle.popleft()
+                self._leases.pop(driver, None)
+                _quit_quietly(driver)
+            self._cond.notify_all()
+
+    def _is_healthy(self, driver):
+        try:
+            return bool(self.health_check(driver))
+        except Exception:
+            return False
+
+    def _recycle(self, driver):
+        """Quit a driver and start its replacement, keeping the pool at its size"""
+
+        self._leases.pop(driver, None)
+        invalidate_snapshot(driver)
+        _quit_quietly(driver)
+        return self._start()
+
+    def _start(self):
+        """Start a driver for an empty slot, leaving the slot vacant if that fails"""
+
+        try:
+            driver = self.factory()
+        except Exception as e:
+            with self._cond:
+                self._vacant += 1
+                self._cond.notify()
+            raise SlimleafException(f'Could not start a replacement driver: {e!r}') from e
+        self._leases[driver] = 0
+        return driver
+
+
+def _quit_quietly(driver):
+    try:
+        driver.quit()
+    except Exception:
+        pass
@@ -0,0 +1,45 @@
+from slimleaf.webdriver.selectors import compiled_selector, xpath_for
+
+
+class ElementField(object):
+    """Declares an element on a page object, built once per page rather than on every access
+
+    e.g. `login = ElementField(ButtonElement, Locator(By.ID, 'login'))`
+
+    Fields are collected into the page class's `_element_fields` registry when the class is defined,
+    with etree locators precompiled and XPath equivalents of locators worked out up front, so a page
+    can locate all of its elements in one round trip (`Page.prefetch_fields`). Each page instance
+    caches the elements it builds until it navigates.
+
+    Args:
+        element_class (type): Element (or ElementList) class to build
+        locator (slimleaf.webdriver.locator.Locator): Defaults to the class's static `_locator`
+        etree_locator (slimleaf.webdriver.locator.Locator): Defaults to the class's
+            `_etree_locator`
+        kwargs: Passed through to `element_class`, e.g. timeout
+    """
+
+    def __init__(self, element_class, locator=None, etree_locator=None, **kwargs):
+        self.element_class = element_class
+        self.locator = locator or getattr(element_class, '_locator', None)
+        self.etree_locator = etree_locator or getattr(element_class, '_etree_locator', None)
+        self.kwargs = kwargs
+        self.xpath = xpath_for(self.locator) if self.locator is not None else None
+        self.name = None
+        if self.etree_locator is not None:
+            compiled_selector(self.etree_locator)
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, page, owner=None):
+        if page is None:
+            return self
+
+        elements = vars(page).setdefault('_elements', {})
+        element = elements.get(self.name)
+        if element is None:
+            element = elements[self.name] = self.element_class(
+                page.driver, locator=self.locator, etree_locator=self.etree_locator, **self.kwargs
+            )
+        return element
@@ -1,10 +1,12 @@
 from appium.webdriver.common.touch_action import TouchAction
 
+from selenium.common.exceptions import StaleElementReferenceException
 from selenium.webdriver.support.expected_conditions import (
     element_to_be_clickable, presence_of_element_located)
-from selenium.webdriver.support.wait import WebDriverWait
 
 from slimleaf.webdriver.exceptions import AttributeNotFoundException
+from slimleaf.webdriver.snapshot import invalidate_snapshot
+from slimleaf.webdriver.wait import SmartWait
 
 
 class Element(object):
@@ -14,33 +16,68 @@ class Element(object):
     static for a particular element, provide the locator as a class attribute and the Element
     can initialized without passing the locator argument.
 
+    Elements are lazy: nothing is located until `web_element` is first used. The located handle is
+    cached (unless `cache` is False) and transparently re-located if it has gone stale.
+
     Args:
         driver (selenium.webdriver): Webdriver that will interface with the app
         locator (slimleaf.webdriver.locator.Locator): Locator used to find element
-        web_element (selenium.webdriver.remote.webelement.WebElement): selenium-level web_element
+        web_element (selenium.webdriver.remote.webelement.WebElement): selenium-level web_element,
+            if already located
+        cache (bool): Whether or not to reuse the located web_element between accesses
     """
 
     _locator = None
 
-    def __init__(self, driver, locator=None, timeout=30, web_element=None, etree_locator=None):
+    def __init__(self, driver, locator=None, timeout=30, web_element=None, etree_locator=None,
+                 cache=True):
         self.driver = driver
         self.locator = locator or self._locator
         self.timeout = timeout
-        self.web_element = self.find()
+        self.cache = cache
+        self._web_element = web_element
         self.etree_locator = etree_locator
 
+    @property
+    def web_element(self):
+        """Selenium-level web element, located on first access"""
+
+        if self._web_element is None or not self.cache:
+            self._web_element = self.find()
+        return self._web_element
+
+    @web_element.setter
+    def web_element(self, elem):
+        self._web_element = elem
+
+    def invalidate(self):
+        """Discard the located web_element so the next access locates it again"""
+
+        self._web_element = None
+        return None
+
     def find(self):
-        elem = WebDriverWait(self.driver, self.timeout).until(
+        elem = SmartWait(self.driver, self.timeout, site='mobile.element.find').until(
             presence_of_element_located(self.locator)
         )
         return elem
 
+    def _with_element(self, action):
+        """Call `action` with the web_element, re-locating it once if it has gone stale"""
+
+        try:
+            return action(self.web_element)
+        except StaleElementReferenceException:
+            self.invalidate()
+            return action(self.web_element)
+
     def tap(self, x=5, y=5):
-        touchable_elem = WebDriverWait(self.driver, self.timeout).until(
+        touchable_elem = SmartWait(self.driver, self.timeout, site='mobile.element.tap').until(
             element_to_be_clickable(self.locator)
         )
         touch_action = TouchAction(driver=self.driver)
         touch_action.tap(element=touchable_elem, x=x, y=y).perform()
+        invalidate_snapshot(self.driver)
 
     @property
     def text(self):
@@ -49,12 +86,12 @@ class Element(object):
         If additional steps are required to retrieve the desired text - e.g. the value attribute of
         an element - this method should be subclassed.
         """
-        txt = self.web_element.text
+        txt = self._with_element(lambda elem: elem.text)
         return txt
 
     @property
     def is_displayed(self):
-        return self.web_element.is_displayed()
+        return self._with_element(lambda elem: elem.is_displayed())
 
 
 class InputElement(Element):
@@ -68,20 +105,22 @@ class InputElement(Element):
     def text(self):
         """Text data from the input element, taken from the `value` attribute"""
 
-        txt = self.web_element.get_attribute('value')
+        txt = self._with_element(lambda elem: elem.get_attribute('value'))
         return txt
 
     @text.setter
     def text(self, txt):
         """Sets the text for this input element as if a user had typed into it."""
 
-        self.web_element.send_keys(txt)
+        self._with_element(lambda elem: elem.send_keys(txt))
+        invalidate_snapshot(self.driver)
         return None
 
     def clear(self):
         """Clears text from an input field"""
 
-        self.web_element.clear()
+        self._with_element(lambda elem: elem.clear())
+        invalidate_snapshot(self.driver)
         return None
 
 
@@ -91,7 +130,7 @@ class SwitchElement(Element):
     @property
     def on(self):
         """Is the switch set to the `on` position? Derived from value attribute."""
-        val = self.web_element.get_attribute('value')
+        val = self._with_element(lambda elem: elem.get_attribute('value'))
         if val is None:
             raise AttributeNotFoundException(
                 f"Element with locator {self.locator} has no value attribute"
@@ -67,6 +67,7 @@ class MobilePage(Page):
     def switch_to_required_context(self):
         try:
             self.driver.switch_to.context(self.required_context)
+            self.invalidate_snapshot()
         except NoSuchContextException:
             available_contexts = self.driver.contexts
             raise SlimleafException(
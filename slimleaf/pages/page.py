@@ -1,11 +1,14 @@
-from lxml import etree
-
-from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import TimeoutException, WebDriverException
 from selenium.webdriver.support.expected_conditions import presence_of_element_located
-from selenium.webdriver.support.wait import WebDriverWait
-from selenium.webdriver.common.by import By
 
 from slimleaf.exceptions import SlimleafException
+from slimleaf.pages.fields import ElementField
+from slimleaf.webdriver.scripts import first_present, prefetch, region_hash
+from slimleaf.webdriver.selectors import SUPPORTED_BYS, compiled_selector, xpath_for
+from slimleaf.webdriver.snapshot import diff_trees, invalidate_snapshot, snapshot_cache
+from slimleaf.webdriver.wait import SmartWait
+
+PREFETCH_ATTRIBUTES = ('id', 'name', 'class', 'type', 'href')
 
 
 class Page(object):
@@ -20,13 +23,38 @@ class Page(object):
         is_current_page (bool): If the page herein described is currently displayed in the web
         html_tree (lxml.etree.ElementBase): lxml tree for rapid and efficient parsing of complex
         element trees
+        snapshot_stats (dict): Hit and miss counts for the cached `html_tree` snapshot
+        page_timeout (float): Duration (seconds) to wait for the unique locator before deciding
+            this page is not displayed
+        _element_fields (dict): Registry of the class's ElementFields (including inherited ones)
+            by attribute name, built once when the class is defined
 
     Args:
         driver
+        page_timeout (float): Overrides the class-level page_timeout for this instance
     """
 
-    def __init__(self, driver):
+    page_timeout = 30
+    _element_fields = {}
+
+    def __init_subclass__(cls, **kwargs):
+        """Register the ElementFields declared on a page class and its bases"""
+
+        super().__init_subclass__(**kwargs)
+        fields = {}
+        for klass in reversed(cls.__mro__):
+            for name, value in vars(klass).items():
+                if isinstance(value, ElementField):
+                    fields[name] = value
+                else:
+                    fields.pop(name, None)  # Overridden by something other than a field
+        cls._element_fields = fields
+
+    def __init__(self, driver, page_timeout=None):
         self.driver = driver
+        self._elements = {}
+        if page_timeout is not None:
+            self.page_timeout = page_timeout
 
     @property
     def unique_locator(self):
@@ -46,10 +74,22 @@ class Page(object):
             1. unique to the page
             2. unlikely to change
         ...and try to locate it.
+
+        Waits up to `page_timeout` seconds; use `wait_for_current_page` for a different timeout.
+        """
+
+        return self.wait_for_current_page()
+
+    def wait_for_current_page(self, timeout=None):
+        """Whether this page's unique locator appears within `timeout` seconds
+
+        Args:
+            timeout (float): Defaults to `page_timeout`. A timeout of 0 checks exactly once.
         """
 
+        timeout = self.page_timeout if timeout is None else timeout
         try:
-            WebDriverWait(self.driver, 30).until(
+            SmartWait(self.driver, timeout, site='page.is_current_page').until(
                 presence_of_element_located(self.unique_locator)
             )
             return True
@@ -60,14 +100,149 @@ class Page(object):
     def html_tree(self):
         """Retrieve page source as lxml tree for fast, efficient data retrieval
 
+        The parsed tree is cached as a snapshot and reused by subsequent lookups until the page
+        navigates, an element is interacted with, or `invalidate_snapshot` is called.
+
         Returns:
             tree (lxml.etree.Element): lxml tree object for hierarchical data retrieval
         """
 
-        parser = etree.HTMLParser(encoding='utf-8')
-        xml = self.driver.page_source.encode('utf-8')
-        tree = etree.fromstring(xml, parser=parser)
-        return tree
+        return snapshot_cache(self.driver).get_tree(self.driver)
+
+    @property
+    def snapshot_stats(self):
+        """Hit and miss counts for the `html_tree` snapshot shared by this page's driver"""
+
+        return snapshot_cache(self.driver).stats
+
+    def invalidate_snapshot(self):
+        """Discard the cached `html_tree`, and the elements built from ElementFields, so the next
+        lookup fetches fresh page source and new elements
+        """
+
+        invalidate_snapshot(self.driver)
+        vars(self).get('_elements', {}).clear()
+        return None
+
+    def prefetch(self, elements=None, attributes=PREFETCH_ATTRIBUTES):
+        """Locate many elements, and read their common properties, in a single script round trip
+
+        Every locator with an XPath equivalent (CSS, XPath, ID, name, class name or tag name) is
+        evaluated in the browser at once, and each element's `web_element` (or each list's
+        `web_elements`) is filled in, so none of them needs its own find round trip afterwards.
+        Elements whose locator has no XPath equivalent, or that are not found, are left to locate
+        themselves on first use. Requires a context that can run scripts, i.e. not a native mobile
+        context.
+
+        Args:
+            elements (iterable): Elements and/or ElementLists; defaults to every ElementField
+            attributes (iterable): names of attributes to read from every located element
+
+        Returns:
+            located (dict): map of each element to its LocatedElement(web_element, properties), or
+                None if it was not found; ElementLists map to a list of LocatedElements
+        """
+
+        if elements is None:  # Fields carry the XPath worked out when the class was defined
+            candidates = [
+                (getattr(self, name), field.xpath) for name, field in self._element_fields.items()
+            ]
+        else:
+            candidates = [
+                (element, xpath_for(element.locator)) for element in elements
+                if element.locator is not None
+            ]
+        candidates = [(element, xpath) for element, xpath in candidates if xpath is not None]
+        many = [hasattr(type(element), 'web_elements') for element, _ in candidates]
+        results = prefetch(self.driver, [xpath for _, xpath in candidates], many, attributes)
+
+        located = {}
+        for (element, _), is_list, matches in zip(candidates, many, results):
+            if is_list:
+                element.web_elements = [match.web_element for match in matches]
+                located[element] = matches
+            elif matches:
+                element.web_element = matches[0].web_element
+                located[element] = matches[0]
+            else:
+                located[element] = None
+        return located
+
+    def prefetch_fields(self):
+        """Locate every ElementField of this page in a single script round trip; see `prefetch`
+
+        Returns:
+            elements (dict): map of field names to the elements that were prefetched
+        """
+
+        located = self.prefetch()
+        elements = {name: getattr(self, name) for name in self._element_fields}
+        return {name: element for name, element in elements.items() if element in located}
+
+    def dom_changes(self):
+        """Subtrees that changed between the previous `html_tree` snapshot and the current one
+
+        Returns:
+            changes (dict): map of XPath etree locators to changed subtrees; see
+                `slimleaf.webdriver.snapshot.diff_trees`. Empty if there is no previous snapshot.
+        """
+
+        previous = snapshot_cache(self.driver).previous
+        if previous is None:
+            return {}
+        return diff_trees(previous, self.html_tree)
+
+    def region_hash(self, region_locator):
+        """Hash of one region's markup, computed in the browser rather than from page source
+
+        Args:
+            region_locator (slimleaf.webdriver.locator.Locator): Any locator with an XPath
+                equivalent (CSS, XPath, ID, name, class name or tag name)
+
+        Returns:
+            digest (str): Hash of the region's outerHTML, or None if the region is absent
+        """
+
+        xpath = xpath_for(region_locator)
+        if xpath is None:
+            raise SlimleafException(f'Region locator {region_locator} has no XPath equivalent')
+        return region_hash(self.driver, xpath)
+
+    def wait_for_dom_change(self, region_locator, timeout=None, baseline=None):
+        """Wait until one region of the page changes, then invalidate the `html_tree` snapshot
+
+        Each poll hashes just the region in the browser, so watching a widget on a large page never
+        transfers or reparses the whole document.
+
+        Args:
+            region_locator (slimleaf.webdriver.locator.Locator): Region to watch
+            timeout (float): Defaults to `page_timeout`
+            baseline (str): `region_hash` taken before the triggering action. Defaults to the
+                region's hash when this is called, which only suits changes that have not yet
+                happened, e.g. the response to a request still in flight.
+
+        Returns:
+            digest (str): The region's new hash, or None if it disappeared
+
+        Raises:
+            TimeoutException: if the region is unchanged after `timeout` seconds
+        """
+
+        timeout = self.page_timeout if timeout is None else timeout
+        if baseline is None:
+            baseline = self.region_hash(region_locator)
+
+        digests = []
+
+        def _changed(driver):
+            digests.append(self.region_hash(region_locator))
+            return digests[-1] != baseline  # A region that disappears has changed, too
+
+        SmartWait(self.driver, timeout, site='page.wait_for_dom_change').until(
+            _changed, message=f'{region_locator} did not change within {timeout}s'
+        )
+        self.invalidate_snapshot()
+        return digests[-1]
 
     def get_element_tree(self, element):
         """Retrieve an lxml tree object for a specific element
@@ -79,29 +254,54 @@ class Page(object):
             tree (lxml.etree.Element) lxml tree with a root matching that of the element
         """
 
-        SUPPORTED_BYS = [By.CSS_SELECTOR, By.XPATH]
+        return self._match_element_tree(self.html_tree, element)
+
+    def get_element_trees(self, elements_or_locators):
+        """Retrieve lxml tree objects for many elements from a single copy of the page source
+
+        Every selector is evaluated against the same `html_tree`, so reading dozens of fields from
+        one page costs a single source fetch and parse rather than one per field.
+
+        Args:
+            elements_or_locators (iterable): Elements with an `etree_locator`, and/or etree
+                locators (slimleaf.webdriver.locator.Locator) themselves
+
+        Returns:
+            trees (dict): map of each element or locator to its matching lxml tree
+
+        Raises:
+            SlimleafException: if any entry matches zero or more than one element tree
+        """
+
+        tree = self.html_tree
+        trees = {
+            item: self._match_element_tree(tree, item) for item in elements_or_locators
+        }
+        return trees
 
-        trees = None
-        if not hasattr(element, 'etree_locator'):
+    @staticmethod
+    def _match_element_tree(tree, element):
+        """Find the single subtree of `tree` matched by an element's (or a bare) etree locator"""
+
+        if isinstance(element, tuple):
+            loctr = element
+        elif getattr(element, 'etree_locator', None) is not None:
+            loctr = element.etree_locator
+        else:
             raise SlimleafException(f'Element {element} does not have an etree locator')
 
-        elif element.etree_locator.by not in SUPPORTED_BYS:
+        if loctr.by not in SUPPORTED_BYS:
             raise SlimleafException(
-                f"Element's etree locator {element.etree_locator.by} not supported. Supported by's "
+                f"Element's etree locator {loctr.by} not supported. Supported by's "
                 f"are {SUPPORTED_BYS}"
             )
 
-        else:
-            loctr = element.etree_locator
-            if loctr.by == By.CSS_SELECTOR:
-                trees = self.html_tree.cssselect(loctr.value)
-            elif loctr.by == By.XPATH:
-                trees = self.html_tree.xpath(loctr.value)
+        trees = compiled_selector(loctr)(tree)
 
         if not trees:
             raise SlimleafException(
                 f'No matching tree object found for element {element} using locator '
-                f'{element.etree_locator}.'
+                f'{loctr}.'
             )
 
         elif len(trees) != 1:
@@ -111,3 +311,50 @@ class Page(object):
 
         else:
             return trees[0]
+
+
+def detect_current_page(candidates, timeout=None):
+    """Identify which of several pages is currently displayed
+
+    Every candidate's unique locator is checked in each poll of a single wait, so probing where a
+    flow landed costs one wait rather than a full timeout per page that was not reached. Where all
+    locators can be expressed as XPath, each poll is a single `execute_script`.
+
+    Args:
+        candidates (iterable): Page instances sharing one driver
+        timeout (float): Defaults to the longest `page_timeout` among the candidates
+
+    Returns:
+        page (Page): The first candidate whose unique locator is present, or None if none appear
+    """
+
+    candidates = list(candidates)
+    if not candidates:
+        return None
+
+    driver = candidates[0].driver
+    if timeout is None:
+        timeout = max(page.page_timeout for page in candidates)
+
+    locators = [page.unique_locator for page in candidates]
+    xpaths = [xpath_for(locator) for locator in locators]
+    use_script = all(xpaths)
+
+    def _displayed_page(driver):
+        nonlocal use_script
+        if use_script:
+            try:
+                index = first_present(driver, xpaths)
+                return candidates[index] if index is not None else False
+            except WebDriverException:
+                use_script = False  # e.g. a native mobile context, which cannot run scripts
+
+        for page, locator in zip(candidates, locators):
+            if driver.find_elements(*locator):
+                return page
+        return False
+
+    try:
+        return SmartWait(driver, timeout, site='page.detect_current_page').until(_displayed_page)
+    except TimeoutException:
+        return None
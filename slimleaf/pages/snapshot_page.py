@@ -0,0 +1,127 @@
+import mmap
+import os
+
+from lxml import etree
+from selenium.webdriver.common.by import By
+
+from slimleaf.exceptions import SlimleafException
+from slimleaf.pages.page import Page
+from slimleaf.webdriver.locator import Locator
+from slimleaf.webdriver.selectors import (
+    SUPPORTED_BYS, compiled_selector, normalized_text, xpath_for
+)
+
+PARSE_CHUNK_SIZE = 1024 * 1024
+
+
+def parse_html(source):
+    """Parse a saved page into an lxml tree
+
+    Files are memory-mapped and fed to the parser in chunks, so a multi-megabyte capture is never
+    read into one Python bytes object.
+
+    Args:
+        source (str|os.PathLike|bytes): Path to a saved HTML file, or the HTML itself as bytes
+
+    Returns:
+        tree (lxml.etree.Element): root of the parsed document
+    """
+
+    parser = etree.HTMLParser(encoding='utf-8')
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        parser.feed(bytes(source))
+        return _closed(parser, source)
+
+    with open(source, 'rb') as html_file:
+        if os.fstat(html_file.fileno()).st_size == 0:
+            raise SlimleafException(f'Snapshot {source} is empty')
+        with mmap.mmap(html_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for start in range(0, len(mapped), PARSE_CHUNK_SIZE):
+                parser.feed(mapped[start:start + PARSE_CHUNK_SIZE])
+    return _closed(parser, source)
+
+
+class SnapshotPage(Page):
+    """Page evaluated against saved HTML rather than a live browser
+
+    Serves `html_tree`, `get_element_tree(s)`, unique locator checks and `find_all` queries with no
+    driver at all, so content assertions can run over captured pages in parallel processes. Mix it
+    in ahead of an existing page class to reuse that page's `unique_locator`, e.g.
+    `class OfflineLoginPage(SnapshotPage, LoginPage)`.
+
+    Args:
+        source (str|os.PathLike|bytes): Path to a saved HTML file, or the HTML itself as bytes
+        unique_locator (slimleaf.webdriver.locator.Locator): Overrides the class's unique locator
+    """
+
+    def __init__(self, source, unique_locator=None):
+        Page.__init__(self, driver=None)  # Skips any live-browser setup of a mixed-in page class
+        self.source = source
+        self._tree = None
+        self._unique_locator = unique_locator
+
+    @property
+    def unique_locator(self):
+        return self._unique_locator or super().unique_locator
+
+    @property
+    def html_tree(self):
+        """The saved page, parsed on first use"""
+
+        if self._tree is None:
+            self._tree = parse_html(self.source)
+        return self._tree
+
+    @property
+    def snapshot_stats(self):
+        return {'hits': 0, 'misses': 0}
+
+    def invalidate_snapshot(self):
+        return None  # A saved page never changes
+
+    def wait_for_current_page(self, timeout=None):
+        """Whether this page's unique locator is present in the snapshot, without waiting"""
+
+        return bool(self.find_all(self.unique_locator))
+
+    def find_all(self, locator, text=None, attributes=None):
+        """Subtrees matching a locator, optionally filtered like `ElementList.filter`
+
+        Args:
+            locator: Locator, or an Element/ElementList with an `etree_locator`. Besides CSS and
+                XPath, ID, name, class name and tag name locators are accepted.
+            text (str): Exact text the subtree must have, ignoring surrounding/repeated whitespace
+            attributes (dict): Map of attribute names to the exact values the subtree must have
+
+        Returns:
+            trees (list): matching lxml elements, in document order
+        """
+
+        if not isinstance(locator, tuple):
+            locator = getattr(locator, 'etree_locator', None)
+        if locator is None:
+            raise SlimleafException('SnapshotPage queries require a locator or an etree locator')
+
+        if locator[0] not in SUPPORTED_BYS:
+            xpath = xpath_for(locator)
+            if xpath is None:
+                raise SlimleafException(
+                    f'Locator {locator} cannot be evaluated against a snapshot. Supported by\'s '
+                    f'are {SUPPORTED_BYS} and those with an XPath equivalent'
+                )
+            locator = Locator(By.XPATH, xpath)
+
+        attributes = attributes or {}
+        matching = [
+            tree for tree in compiled_selector(locator)(self.html_tree)
+            if (text is None or normalized_text(''.join(tree.itertext())) == normalized_text(text))
+            and all(tree.get(name) == value for name, value in attributes.items())
+        ]
+        return matching
+
+
+def _closed(parser, source):
+    tree = parser.close()
+    if tree is None:
+        raise SlimleafException(f'Snapshot {source!r:.80} contains no HTML')
+    return tree
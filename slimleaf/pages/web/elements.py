@@ -1,12 +1,18 @@
 import re
 from selenium.webdriver import ActionChains
 from selenium.webdriver.support.select import Select
-from selenium.common.exceptions import UnexpectedTagNameException, NoSuchElementException
+from selenium.common.exceptions import (
+    StaleElementReferenceException, UnexpectedTagNameException, NoSuchElementException)
 from selenium.webdriver.support.expected_conditions import (
     element_to_be_clickable, presence_of_element_located)
-from selenium.webdriver.support.wait import WebDriverWait
+from selenium.webdriver.common.by import By
 
 from slimleaf.exceptions import SlimleafException
+from slimleaf.webdriver.locator import Locator
+from slimleaf.webdriver.scripts import read_properties
+from slimleaf.webdriver.selectors import compiled_selector, normalized_text, xpath_for
+from slimleaf.webdriver.snapshot import invalidate_snapshot, snapshot_cache
+from slimleaf.webdriver.wait import SmartWait, element_clickable
 
 
 class Element(object):
@@ -16,35 +22,91 @@ class Element(object):
     static for a particular element, provide the locator as a class attribute and the Element
     can initialized without passing the locator argument.
 
+    Elements are lazy: nothing is located until `web_element` is first used. The located handle is
+    cached (unless `cache` is False) and transparently re-located if it has gone stale.
+
     Args:
         driver (selenium.webdriver): Webdriver that will interface with the web
         locator (slimleaf.webdriver.locator.Locator): Locator used to find element
         etree_locator (slimleaf.webdriver.locator.Locator); Locator used to find lxml element trees
         timeout (int): Duration (seconds) to wait for an element before a TimeoutException is raised
-        web_element (selenium.webdriver.remote.webelement.WebElement): selenium-level web_element
+        web_element (selenium.webdriver.remote.webelement.WebElement): selenium-level web_element,
+            if already located
+        cache (bool): Whether or not to reuse the located web_element between accesses
     """
 
     _locator = None
     _etree_locator = None
 
-    def __init__(self, driver, locator=None, etree_locator=None, timeout=30, web_element=None):
+    def __init_subclass__(cls, **kwargs):
+        """Precompile a static etree locator once, when the element class is defined"""
+
+        super().__init_subclass__(**kwargs)
+        if cls._etree_locator is not None:
+            compiled_selector(cls._etree_locator)
+
+    def __init__(self, driver, locator=None, etree_locator=None, timeout=30, web_element=None,
+                 cache=True):
         self.driver = driver
         self.locator = locator or self._locator
         self.timeout = timeout
-        self.web_element = self.find()
+        self.cache = cache
+        self._web_element = web_element
         self.etree_locator = etree_locator or self._etree_locator
 
+    @property
+    def web_element(self):
+        """Selenium-level web element, located on first access"""
+
+        if self._web_element is None or not self.cache:
+            self._web_element = self.find()
+        return self._web_element
+
+    @web_element.setter
+    def web_element(self, elem):
+        self._web_element = elem
+
+    def invalidate(self):
+        """Discard the located web_element so the next access locates it again"""
+
+        self._web_element = None
+        return None
+
     def find(self):
-        elem = WebDriverWait(self.driver, self.timeout).until(
+        elem = SmartWait(self.driver, self.timeout, site='element.find').until(
             presence_of_element_located(self.locator)
         )
         return elem
 
+    def _with_element(self, action):
+        """Call `action` with the web_element, re-locating it once if it has gone stale"""
+
+        try:
+            return action(self.web_element)
+        except StaleElementReferenceException:
+            self.invalidate()
+            return action(self.web_element)
+
     def click(self):
-        elem = WebDriverWait(self.driver, self.timeout).until(
-            element_to_be_clickable(self.locator)
-        )
-        elem.click()
+        """Clicks the element once it is clickable.
+
+        Clickability is checked on the already-located web_element; the locator is only queried
+        again if that element has gone stale.
+        """
+
+        try:
+            elem = SmartWait(self.driver, self.timeout, site='element.click').until(
+                element_clickable(self.web_element)
+            )
+            elem.click()
+        except StaleElementReferenceException:
+            self.invalidate()
+            elem = SmartWait(self.driver, self.timeout, site='element.click.relocate').until(
+                element_to_be_clickable(self.locator)
+            )
+            self.web_element = elem
+            elem.click()
+        invalidate_snapshot(self.driver)
         return None
 
     @property
@@ -54,12 +116,12 @@ class Element(object):
         If additional steps are required to retrieve the desired text - e.g. the value attribute of
         an element - this method should be subclassed.
         """
-        txt = self.web_element.text
+        txt = self._with_element(lambda elem: elem.text)
         return txt
 
     @property
     def is_displayed(self):
-        return self.web_element.is_displayed()
+        return self._with_element(lambda elem: elem.is_displayed())
 
     def scroll_into_view(self, offset=None):
         """Scrolls element into view.
@@ -67,7 +129,9 @@ class Element(object):
         If an offset is desired, passing an integer (pixels) will scroll the Y axis accordingly.
         """
 
-        self.driver.execute_script("arguments[0].scrollIntoView(true);", self.web_element)
+        self._with_element(
+            lambda elem: self.driver.execute_script("arguments[0].scrollIntoView(true);", elem)
+        )
         if offset:
             self.driver.execute_script("window.scrollBy(0, {0});".format(offset))
 
@@ -79,14 +143,15 @@ class InputElement(Element):
     def text(self):
         """Text data from the input element, taken from the `value` attribute"""
 
-        txt = self.web_element.get_attribute('value')
+        txt = self._with_element(lambda elem: elem.get_attribute('value'))
         return txt
 
 
     def clear(self):
         """Clears the content of currently active input field"""
 
-        self.web_element.clear()
+        self._with_element(lambda elem: elem.clear())
+        invalidate_snapshot(self.driver)
         return None
 
 
@@ -95,7 +160,8 @@ class InputElement(Element):
         """Sets the text for this input element as if a user had typed into it."""
 
         self.clear()
-        self.web_element.send_keys(txt)
+        self._with_element(lambda elem: elem.send_keys(txt))
+        invalidate_snapshot(self.driver)
         return None
 
 
@@ -103,24 +169,49 @@ class CheckboxElement(InputElement):
     """Checkbox-style input element"""
     @property
     def is_checked(self):
-        return self.web_element.get_attribute('checked') == 'checked'
+        return self._with_element(lambda elem: elem.get_attribute('checked')) == 'checked'
 
 
 class RadioField(object):
-    """Radio field for webpages"""
+    """Radio field for webpages
+
+    The selected state of every input is read in a single script round trip rather than one
+    `is_selected()` call per input.
+
+    Args:
+        driver (selenium.webdriver): Webdriver that will interface with the web. Defaults to the
+            driver of the first input added.
+    """
 
-    def __init__(self):
+    def __init__(self, driver=None):
+        self.driver = driver
         self.inputs = []
 
     def add_input(self, input_element):
         self.inputs.append(input_element)
 
     @property
-    def selected(self, multi=False):
-        """Returns all selected inputs. If multi is set to False, only the first is returned."""
-        selected_inputs = [input_elem for input_elem in self.inputs if input_elem.selected]
-        selected_input = selected_inputs if multi else selected_inputs[0]
-        return selected_input
+    def selected(self):
+        """Returns the first selected input"""
+        return self.selected_inputs[0]
+
+    @property
+    def selected_inputs(self):
+        """Returns all selected inputs"""
+        if not self.inputs:
+            return []
+
+        try:
+            states = self._read_inputs()
+        except StaleElementReferenceException:
+            for input_elem in self.inputs:
+                input_elem.invalidate()
+            states = self._read_inputs()
+        return [input_elem for input_elem, state in zip(self.inputs, states) if state.selected]
+
+    def _read_inputs(self):
+        web_elements = [input_elem.web_element for input_elem in self.inputs]
+        return read_properties(self.driver or self.inputs[0].driver, web_elements)
 
 
 class RadioInputElement(InputElement):
@@ -128,7 +219,7 @@ class RadioInputElement(InputElement):
 
     @property
     def selected(self):
-        return self.web_element.is_selected()
+        return self._with_element(lambda elem: elem.is_selected())
 
 
 class NotAValidSelectOption(SlimleafException):
@@ -144,29 +235,53 @@ class NotASelectElementException(SlimleafException):
 
 
 class SelectElement(Element):
+    """Dropdown (select) element
+
+    The Selenium `Select` wrapper is built lazily from the located web_element and rebuilt
+    whenever the web_element is re-located, so a NotASelectElementException surfaces on first use.
+    """
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        try:
-            self.select_elem = Select(self.web_element)
-        except UnexpectedTagNameException as e:
-            raise NotASelectElementException(self.web_element.tag_name) from e
+        self._select_elem = None
+        self._select_source = None
+
+    @property
+    def select_elem(self):
+        return self._select_for(self.web_element)
+
+    def _select_for(self, web_element):
+        if self._select_elem is None or self._select_source is not web_element:
+            try:
+                self._select_elem = Select(web_element)
+            except UnexpectedTagNameException as e:
+                raise NotASelectElementException(web_element.tag_name) from e
+            self._select_source = web_element
+        return self._select_elem
+
+    def _with_select(self, action):
+        """Call `action` with the Select wrapper, re-locating it once if it has gone stale"""
+
+        return self._with_element(lambda elem: action(self._select_for(elem)))
 
     @property
     def text(self):
         """Text value for first selected option in a dropdown (select) element"""
 
-        selected_option = self.select_elem.first_selected_option
-        return selected_option.text
+        return self._with_select(lambda select: select.first_selected_option.text)
 
     def choose(self, txt):
         try:
-            self.select_elem.select_by_visible_text(txt)
+            self._with_select(lambda select: select.select_by_visible_text(txt))
         except NoSuchElementException as e:
             raise NotAValidSelectOption(txt) from e
+        invalidate_snapshot(self.driver)
 
     @property
     def options(self):
-        option_txt = [elem.text for elem in self.select_elem.options]
+        option_txt = self._with_select(
+            lambda select: [option.text for option in read_properties(self.driver, select.options)]
+        )
         return option_txt
 
 
@@ -211,10 +326,14 @@ class MenuElement(Element):
 
     def hover(self, return_options=True):
         """Moves to element to activate the dropdown and can return dropdown options"""
-        actions = ActionChains(self.driver)
-        actions.move_to_element(self.web_element)
-        actions.click(self.web_element)
-        actions.perform()
+        def _hover(elem):
+            actions = ActionChains(self.driver)
+            actions.move_to_element(elem)
+            actions.click(elem)
+            actions.perform()
+
+        self._with_element(_hover)
+        invalidate_snapshot(self.driver)
 
         if return_options:
             return self.options
@@ -224,3 +343,191 @@ class AnchorElement(Element):
     """Represents an anchor element on a page"""
 
     pass
+
+
+class ElementList(object):
+    """Collection of elements sharing a single locator, e.g. the rows of a table.
+
+    All matching elements are located with one `find_elements` call, and their properties can be
+    read in bulk with one script round trip. Items are wrapped in `item_class` lazily, only when
+    indexed or iterated, so counting or filtering a thousand rows does not build a thousand
+    elements. If a locator is static for a particular list, provide it as a class attribute and the
+    list can be initialized without passing the locator argument.
+
+    Args:
+        driver (selenium.webdriver): Webdriver that will interface with the web
+        locator (slimleaf.webdriver.locator.Locator): Locator matching every item in the list
+        item_class (type): Element class used to wrap each item
+        etree_locator (slimleaf.webdriver.locator.Locator): Locator matching every item in the
+            page's html_tree. Derived from `locator` when not provided.
+        timeout (int): Duration (seconds) each item waits when it must be located again
+    """
+
+    _locator = None
+    _etree_locator = None
+    item_class = Element
+
+    def __init__(self, driver, locator=None, item_class=None, etree_locator=None, timeout=30):
+        self.driver = driver
+        self.locator = locator or self._locator
+        self.item_class = item_class or self.item_class
+        self.etree_locator = etree_locator or self._etree_locator
+        self.timeout = timeout
+        self._web_elements = None
+        self._located_generation = None
+        self._items = {}
+
+    @property
+    def etree_locator(self):
+        """Locator matching every item in the html_tree, derived from `locator` when not given
+
+        None when `locator` has no XPath equivalent, in which case items are read by script.
+        """
+
+        if self._given_etree_locator is not None:
+            return self._given_etree_locator
+        xpath = xpath_for(self.locator) if self.locator is not None else None
+        return Locator(By.XPATH, xpath) if xpath else None
+
+    @etree_locator.setter
+    def etree_locator(self, locator):
+        self._given_etree_locator = locator
+
+    @property
+    def web_elements(self):
+        """Selenium-level web elements for every item, located on first access"""
+
+        if self._web_elements is None:
+            self._located_generation = snapshot_cache(self.driver).generation
+            self._web_elements = self.driver.find_elements(*self.locator)
+        return self._web_elements
+
+    @web_elements.setter
+    def web_elements(self, elems):
+        self._located_generation = snapshot_cache(self.driver).generation
+        self._web_elements = list(elems)
+        self._items = {}
+
+    def invalidate(self):
+        """Discard the located web_elements so the next access locates them again"""
+
+        self._web_elements = None
+        self._items = {}
+        return None
+
+    def __len__(self):
+        return len(self.web_elements)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self._item(index)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._item(i) for i in range(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(f'{type(self).__name__} index out of range')
+        return self._item(index)
+
+    def _item(self, index):
+        item = self._items.get(index)
+        if item is None:
+            item = self._items[index] = self.item_class(
+                self.driver,
+                locator=self._item_locator(index),
+                timeout=self.timeout,
+                web_element=self.web_elements[index],
+            )
+        return item
+
+    def _item_locator(self, index):
+        """Locator for the nth item alone, so a stale item can be located again by itself
+
+        None when `locator` has no XPath equivalent: the list's own locator would find the first
+        item rather than the nth.
+        """
+
+        xpath = xpath_for(self.locator) if self.locator is not None else None
+        return Locator(By.XPATH, f'({xpath})[{index + 1}]') if xpath else None
+
+    def read(self, attributes=(), text_content=False):
+        """Read text, value, selected and displayed state (plus any attributes) of every item
+
+        Args:
+            attributes (iterable): names of additional attributes to read from every item
+            text_content (bool): Read each item's `textContent` rather than its rendered text
+
+        Returns:
+            properties (list): slimleaf.webdriver.scripts.ElementProperties for each item
+        """
+
+        try:
+            return read_properties(self.driver, self.web_elements, attributes, text_content)
+        except StaleElementReferenceException:
+            self.invalidate()
+            return read_properties(self.driver, self.web_elements, attributes, text_content)
+
+    @property
+    def texts(self):
+        return [item.text for item in self.read()]
+
+    @property
+    def values(self):
+        return [item.value for item in self.read()]
+
+    def filter(self, text=None, attributes=None):
+        """Items whose text and/or attributes match, without a round trip per item
+
+        Matching is done against the driver's html_tree snapshot when it was taken after the items
+        were located and lines up one-to-one with them; otherwise every item is read with a single
+        script call. Either way an item's text is its DOM text content, hidden text included.
+
+        Args:
+            text (str): Exact text content the item must have, ignoring surrounding/repeated
+                whitespace
+            attributes (dict): Map of attribute names to the exact values the item must have
+
+        Returns:
+            items (list): wrapped items that match, in document order
+        """
+
+        attributes = attributes or {}
+        candidates = self._snapshot_properties(list(attributes))
+        if candidates is None:
+            candidates = [
+                (normalized_text(item.text), item.attributes)
+                for item in self.read(list(attributes), text_content=True)
+            ]
+
+        matching = [
+            self._item(index)
+            for index, (item_text, item_attributes) in enumerate(candidates)
+            if (text is None or item_text == normalized_text(text))
+            and all(item_attributes.get(name) == value for name, value in attributes.items())
+        ]
+        return matching
+
+    def _snapshot_properties(self, attributes):
+        if self.etree_locator is None:
+            return None
+
+        located = len(self)  # Locates the items before any snapshot is taken
+        cache = snapshot_cache(self.driver)
+        if cache.tree is not None and cache.generation <= self._located_generation:
+            return None  # Snapshot predates the items; the DOM may have changed in between
+
+        html_tree = cache.get_tree(self.driver)
+        trees = compiled_selector(self.etree_locator)(html_tree)
+        if len(trees) != located:
+            return None
+
+        return [
+            (
+                normalized_text(''.join(tree.itertext())),
+                {name: tree.get(name) for name in attributes},
+            )
+            for tree in trees
+        ]
@@ -1,16 +1,27 @@
 from selenium.webdriver.support.expected_conditions import (
     presence_of_element_located, staleness_of)
-from selenium.webdriver.support.wait import WebDriverWait
 from selenium.webdriver.common.by import By
 
 from slimleaf.pages.page import Page
 from slimleaf.exceptions import SlimleafException
+from slimleaf.webdriver.snapshot import invalidate_snapshot
+from slimleaf.webdriver.wait import SmartWait
 
 
 class PageMismatchException(SlimleafException):
     pass
 
 
+def close_window(driver):
+    """Closes the driver's current window handle and switches to the last opened handle"""
+
+    driver.close()
+    last_opened_window = driver.window_handles[-1]
+    driver.switch_to.window(last_opened_window)
+    invalidate_snapshot(driver)
+    return None
+
+
 class WebPage(Page):
     """Base Page containing useful functionality for describing a Web Page
 
@@ -51,15 +62,19 @@ class WebPage(Page):
 
         return self.driver.current_url
 
-    def go(self):
+    def go(self, timeout=None):
         """Navigate to this page using a webdriver
 
         In cases where this page is only reached via navigating from another page, and cannot
         be reached via typing a URL into the web, this should not be used.
+
+        Args:
+            timeout (float): Duration (seconds) to wait for arrival; defaults to `page_timeout`
         """
 
         self.driver.get(self.url)
-        if not self.is_current_page:
+        self.invalidate_snapshot()
+        if not self.wait_for_current_page(timeout):
             raise PageMismatchException(
                 "Expected to arrive at {expected} but arrived at {actual} instead.".format(
                     expected=self.url,
@@ -72,31 +87,37 @@ class WebPage(Page):
         """Equivalent of clicking Back on a browser UI"""
 
         self.driver.back()
+        self.invalidate_snapshot()
         return None
 
     def forward(self):
         """Equivalent of clicking Forward on a browser UI"""
 
         self.driver.forward()
+        self.invalidate_snapshot()
         return None
 
     def refresh(self, timeout=30):
         """Refreshes a page and waits for the HTML element to go stale to avoid proceeding prematurely"""
 
         locator = (By.CSS_SELECTOR, 'html')
-        html_elem = WebDriverWait(self.driver, timeout).until(presence_of_element_located(locator))
+        html_elem = SmartWait(self.driver, timeout, site='page.refresh').until(
+            presence_of_element_located(locator)
+        )
         self.driver.refresh()
 
         # Wait until previous element has gone stale
-        WebDriverWait(self.driver, timeout).until(staleness_of(html_elem))
+        SmartWait(self.driver, timeout, site='page.refresh.staleness').until(
+            staleness_of(html_elem)
+        )
+        self.invalidate_snapshot()
         return None
 
     def close(self):
         """Closes the current window handle and switches to the last opened handle"""
 
-        self.driver.close()
-        last_opened_window = self.driver.window_handles[-1]
-        self.driver.switch_to.window(last_opened_window)
+        close_window(self.driver)
+        self.invalidate_snapshot()  # Also drops this page's cached ElementField elements
         return None
 
     # Scrolling
@@ -133,4 +154,5 @@ class WebPage(Page):
 
     def switch_to_window(self, handle):
         self.driver.switch_to.window(handle)
+        self.invalidate_snapshot()
         return None
@@ -1 +1,5 @@
-from .requests import validated_request
\ No newline at end of file
+from .metrics import METRICS, MetricsRegistry  # noqa
+from .requests import RequestSpec, validated_request, validated_requests  # noqa
+from .retry import BREAKER, DEFAULT_RETRY, NO_RETRY, CircuitBreaker, RetryPolicy  # noqa
+from .sessions import SESSIONS, close_sessions, shared_session  # noqa
+from .streaming import hash_response, iter_chunks, save_response, validated_stream  # noqa
@@ -0,0 +1,185 @@
+"""Asyncio variants of the validated request helpers.
+
+Uses aiohttp when it is installed (`pip install slimleaf[aio]`). Without it, requests are sent
+through the shared, pooled `requests` sessions on the event loop's default executor, so the same
+code runs either way.
+"""
+import asyncio
+from functools import partial
+import json
+from urllib.parse import urlsplit
+from weakref import WeakKeyDictionary
+
+from requests.exceptions import ConnectionError, ConnectTimeout
+
+from slimleaf.exceptions import SlimleafException
+from slimleaf.requests.requests import FAILED_RQST_MSG, RequestSpec
+from slimleaf.requests.sessions import DEFAULT_POOL_SIZE, shared_session
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None
+
+
+class AioResponse(object):
+    """Fully read HTTP response, independent of the backend that fetched it
+
+    Attributes:
+        status_code (int): HTTP status code
+        headers (Mapping): Response headers
+        content (bytes): Response body
+        url (str): Final URL of the response
+        encoding (str): Encoding used to decode `text`
+    """
+
+    def __init__(self, status_code, headers, content, url, encoding=None):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.url = url
+        self.encoding = encoding or 'utf-8'
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding, errors='replace')
+
+    def json(self):
+        return json.loads(self.content)
+
+
+_sessions = WeakKeyDictionary()  # event loop -> {base url: aiohttp.ClientSession}
+
+
+def shared_aio_session(url):
+    """Shared aiohttp session for the running event loop and the base URL of `url`"""
+
+    parts = urlsplit(url)
+    base = f'{parts.scheme}://{parts.netloc}'
+    sessions = _sessions.setdefault(asyncio.get_running_loop(), {})
+    session = sessions.get(base)
+    if session is None or session.closed:
+        connector = aiohttp.TCPConnector(limit_per_host=DEFAULT_POOL_SIZE, ssl=False)
+        session = sessions[base] = aiohttp.ClientSession(connector=connector)
+    return session
+
+
+async def close_sessions():
+    """Close every shared aiohttp session belonging to the running event loop"""
+
+    sessions = _sessions.pop(asyncio.get_running_loop(), {})
+    for session in sessions.values():
+        await session.close()
+    return None
+
+
+async def validated_request(method, url, expect, desc='', session=None, timeout=30, **kwargs):
+    """Performs an HTTP request without blocking the event loop and validates the response
+    against an expected status code, exactly like `slimleaf.requests.validated_request`.
+
+    Args:
+        method (str): GET, POST, PUT, DELETE, etc.
+        url (str): Request URL
+        expect (int): Expected status code
+        desc (str): Description of what request is attempting to accomplish
+        session (aiohttp.ClientSession): Defaults to the shared session for the URL's base
+        timeout (float): Total seconds allowed for the request
+        kwargs: Passed through to the backend's request method
+
+    Returns:
+        resp (AioResponse)
+    """
+
+    if aiohttp is not None:
+        session = session or shared_aio_session(url)
+        resp = await _aiohttp_request(session, method, url, timeout, **kwargs)
+    else:
+        session = session or shared_session(url)
+        resp = await _executor_request(session, method, url, timeout, **kwargs)
+
+    if resp.status_code != expect:
+        raise SlimleafException(
+            FAILED_RQST_MSG.format(
+                exp=expect,
+                act=resp.status_code,
+                desc=desc,
+                url=url,
+                hdrs=session.headers,
+                body=kwargs.get('data', kwargs.get('json')),
+                resp=resp.content[:500].decode(resp.encoding, errors='replace')
+            )
+        )
+    return resp
+
+
+async def validated_requests(specs, limit=10):
+    """Performs many validated requests concurrently, returning responses in the order given.
+
+    Args:
+        specs (iterable): RequestSpec(method, url, expect, desc='', kwargs=None) for each request,
+            or dicts with the same keys
+        limit (int): Maximum number of requests in flight at once
+
+    Returns:
+        responses (list): AioResponse for each spec, in input order
+
+    Raises:
+        SlimleafException: listing every failed request, once all have completed
+    """
+
+    specs = [
+        RequestSpec(**spec) if isinstance(spec, dict) else RequestSpec(*spec) for spec in specs
+    ]
+    semaphore = asyncio.Semaphore(limit)
+
+    async def _request(spec):
+        async with semaphore:
+            return await validated_request(
+                spec.method, spec.url, spec.expect, desc=spec.desc, **(spec.kwargs or {})
+            )
+
+    outcomes = await asyncio.gather(*[_request(spec) for spec in specs], return_exceptions=True)
+
+    failures = [
+        f'[{index}] {spec.method} {spec.url}: {outcome}'
+        for index, (spec, outcome) in enumerate(zip(specs, outcomes))
+        if isinstance(outcome, Exception)
+    ]
+    if failures:
+        raise SlimleafException(
+            f'{len(failures)} of {len(specs)} requests failed:\n\n' + '\n\n'.join(failures)
+        )
+    return outcomes
+
+
+async def _aiohttp_request(session, method, url, timeout, **kwargs):
+    try:
+        async with session.request(
+            method, url, timeout=aiohttp.ClientTimeout(total=timeout), **kwargs
+        ) as raw:
+            content = await raw.read()
+            return AioResponse(raw.status, raw.headers, content, str(raw.url), raw.charset)
+
+    except asyncio.TimeoutError as conn_tout:
+        raise SlimleafException(f'Connection to {url} timed out. Exception: {conn_tout!r}')
+
+    except aiohttp.ClientConnectionError as conn_err:
+        raise SlimleafException(
+            f'Connection to {url} was refused. Is it available? Exception: {conn_err}'
+        )
+
+
+async def _executor_request(session, method, url, timeout, **kwargs):
+    request = partial(session.request, method, url, timeout=timeout, verify=False, **kwargs)
+    try:
+        raw = await asyncio.get_running_loop().run_in_executor(None, request)
+
+    except ConnectTimeout as conn_tout:
+        raise SlimleafException(f'Connection to {url} timed out. Exception: {conn_tout}')
+
+    except ConnectionError as conn_err:
+        raise SlimleafException(
+            f'Connection to {url} was refused. Is it available? Exception: {conn_err}'
+        )
+
+    return AioResponse(raw.status_code, raw.headers, raw.content, raw.url, raw.encoding)
@@ -0,0 +1,190 @@
+from collections import Counter
+import json
+import re
+from threading import Lock
+from urllib.parse import urlsplit
+
+
+SUB_BUCKET_BITS = 7  # 2**7 sub-buckets per power of two: values are kept within ~1% of their true size
+
+_UUID = re.compile(r'^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$')
+_HEX = re.compile(r'^[0-9a-fA-F]{16,}$')
+
+
+def template_path(url):
+    """Endpoint template for a URL's path, replacing IDs so calls group by endpoint
+
+    e.g. '/users/123/orders/9f86d081884c7d65?page=2' -> '/users/{id}/orders/{hex}'
+    """
+
+    segments = []
+    for segment in urlsplit(url).path.split('/'):
+        if segment.isdigit():
+            segment = '{id}'
+        elif _UUID.match(segment):
+            segment = '{uuid}'
+        elif _HEX.match(segment):
+            segment = '{hex}'
+        segments.append(segment)
+    return '/'.join(segments) or '/'
+
+
+class Histogram(object):
+    """HDR-style histogram of durations, with constant relative precision and bounded memory
+
+    Values are recorded in microseconds into log-linear buckets: each power of two is split into
+    2**SUB_BUCKET_BITS equal sub-buckets, so any quantile is reported within about 1% of the true
+    value no matter how wide the range of latencies.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+        self._buckets = Counter()
+
+    def record(self, seconds):
+        micros = max(int(seconds * 1000000), 0)
+        shift = max(micros.bit_length() - SUB_BUCKET_BITS, 0)
+        self._buckets[(micros >> shift) << shift] += 1
+
+        self.count += 1
+        self.sum += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = seconds if self.max is None else max(self.max, seconds)
+
+    def quantile(self, q):
+        """Duration (seconds) below which a fraction `q` of recorded values fall"""
+
+        if not self.count:
+            return None
+        threshold = q * self.count
+        seen = 0
+        for lower_bound in sorted(self._buckets):
+            seen += self._buckets[lower_bound]
+            if seen >= threshold:
+                return min(max(lower_bound / 1000000, self.min), self.max)
+        return self.max
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'min': self.min,
+            'max': self.max,
+            'p50': self.quantile(0.5),
+            'p90': self.quantile(0.9),
+            'p99': self.quantile(0.99),
+        }
+
+
+class EndpointMetrics(object):
+    """Timings, statuses and bytes transferred for one method and templated path"""
+
+    def __init__(self):
+        self.total = Histogram()
+        self.ttfb = Histogram()
+        self.statuses = Counter()
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+    def to_dict(self):
+        return {
+            'total_seconds': self.total.to_dict(),
+            'ttfb_seconds': self.ttfb.to_dict(),
+            'statuses': {str(status): count for status, count in self.statuses.items()},
+            'bytes_sent': self.bytes_sent,
+            'bytes_received': self.bytes_received,
+        }
+
+
+class MetricsRegistry(object):
+    """In-process, thread-safe registry of request metrics, keyed by method and templated path
+
+    `validated_request` records every call here. Export at the end of a test session with
+    `to_json()` or `to_prometheus()`.
+    """
+
+    QUANTILES = (0.5, 0.9, 0.99)
+
+    def __init__(self):
+        self._endpoints = {}
+        self._lock = Lock()
+
+    def record(self, method, url, status, total, ttfb=None, bytes_sent=0, bytes_received=0):
+        """Record one HTTP call
+
+        Args:
+            method (str): HTTP method
+            url (str): Request URL, templated with `template_path`
+            status (int): Response status code, or 'error' if no response was received
+            total (float): Seconds from sending the request to having the response
+            ttfb (float): Seconds until the response headers arrived, where available
+            bytes_sent (int): Size of the request body
+            bytes_received (int): Size of the response body
+        """
+
+        key = (method.upper(), template_path(url))
+        with self._lock:
+            endpoint = self._endpoints.get(key)
+            if endpoint is None:
+                endpoint = self._endpoints[key] = EndpointMetrics()
+            endpoint.total.record(total)
+            if ttfb is not None:
+                endpoint.ttfb.record(ttfb)
+            endpoint.statuses[status] += 1
+            endpoint.bytes_sent += bytes_sent
+            endpoint.bytes_received += bytes_received
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                f'{method} {path}': endpoint.to_dict()
+                for (method, path), endpoint in sorted(self._endpoints.items())
+            }
+
+    def to_json(self, **kwargs):
+        return json.dumps(self.to_dict(), **kwargs)
+
+    def to_prometheus(self, prefix='slimleaf_request'):
+        """Prometheus text exposition: duration summaries plus status and byte counters"""
+
+        lines = [
+            f'# TYPE {prefix}_duration_seconds summary',
+            f'# TYPE {prefix}_ttfb_seconds summary',
+            f'# TYPE {prefix}s_total counter',
+            f'# TYPE {prefix}_bytes_sent_total counter',
+            f'# TYPE {prefix}_bytes_received_total counter',
+        ]
+        with self._lock:
+            for (method, path), endpoint in sorted(self._endpoints.items()):
+                labels = f'method="{method}",endpoint="{_escaped(path)}"'
+                for name, histogram in [('duration', endpoint.total), ('ttfb', endpoint.ttfb)]:
+                    if not histogram.count:
+                        continue
+                    for q in self.QUANTILES:
+                        lines.append(
+                            f'{prefix}_{name}_seconds{{{labels},quantile="{q}"}} '
+                            f'{histogram.quantile(q)}'
+                        )
+                    lines.append(f'{prefix}_{name}_seconds_sum{{{labels}}} {histogram.sum}')
+                    lines.append(f'{prefix}_{name}_seconds_count{{{labels}}} {histogram.count}')
+                for status, count in sorted(endpoint.statuses.items(), key=str):
+                    lines.append(f'{prefix}s_total{{{labels},status="{status}"}} {count}')
+                lines.append(f'{prefix}_bytes_sent_total{{{labels}}} {endpoint.bytes_sent}')
+                lines.append(
+                    f'{prefix}_bytes_received_total{{{labels}}} {endpoint.bytes_received}'
+                )
+        return '\n'.join(lines) + '\n'
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+
+
+def _escaped(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"')
+
+
+METRICS = MetricsRegistry()
@@ -1,6 +1,15 @@
-import requests
+from codecs import getincrementaldecoder
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+from urllib.parse import urlsplit
+
+from requests.exceptions import ConnectionError, ConnectTimeout
 
 from slimleaf.exceptions import SlimleafException
+from slimleaf.requests.metrics import METRICS
+from slimleaf.requests.retry import BREAKER, DEFAULT_RETRY
+from slimleaf.requests.sessions import SESSIONS, shared_session
 
 
 FAILED_RQST_MSG = """Expected a response of {exp}, got {act}\n
@@ -11,17 +20,37 @@ FAILED_RQST_MSG = """Expected a response of {exp}, got {act}\n
                     Response: {resp}"""
 
 
-def validated_request(method, url, expect, desc='', session=None, timeout=30, *args, **kwargs):
+RequestSpec = namedtuple('RequestSpec', ['method', 'url', 'expect', 'desc', 'kwargs'])
+RequestSpec.__new__.__defaults__ = ('', None)
+
+
+def validated_request(method, url, expect, desc='', session=None, timeout=30, *args, retry=None,
+                      breaker=BREAKER, metrics=METRICS, **kwargs):
     """Performs HTTP request and validates the response against an expected status code. Shrinks
     test code and provides actionable, readable Exceptions when things do not go as
     expected.
 
+    Connection failures and overloaded responses (429/502/503/504, unless expected) are retried
+    with exponential backoff according to `retry`. Only those failures count toward the host's
+    circuit breaker; requests to a host whose circuit breaker is open fail immediately rather than
+    waiting out the timeout.
+
+    Every attempt's timing, status and size is recorded in `metrics`, grouped by method and
+    templated path.
+
     Args:
-        session (requests.Session): A session, presumably headers are already in desired state
+        session (requests.Session): A session, presumably headers are already in desired state.
+            Defaults to the shared, pooled session for the URL's scheme, host and thread, which
+            keeps no cookies between requests.
         method (str): GET, POST, PUT, DELETE, etc.
         url (str): Request URL
         expect (int): Expected status code
         desc (str): Description of what request is attempting to accomplish, e.g. 'Retrieve some data'
+        retry (slimleaf.requests.retry.RetryPolicy): Defaults to DEFAULT_RETRY, which retries
+            idempotent methods only. Use NO_RETRY to disable retries.
+        breaker (slimleaf.requests.retry.CircuitBreaker): Per-host breaker; None disables it
+        metrics (slimleaf.requests.metrics.MetricsRegistry): Where timings are recorded; None
+            disables recording
         args: Passed through to Request
         kwargs: Passed through to Request
 
@@ -29,19 +58,54 @@ def validated_request(method, url, expect, desc='', session=None, timeout=30, *a
         resp (requests.Response)
 
     """
-    session = session or requests.Session()
-    try:
-        resp = session.request(method, url, *args, timeout=timeout, verify=False, **kwargs)
+    session = session or shared_session(url)
+    retry = retry or DEFAULT_RETRY
+    host = urlsplit(url).netloc
+    attempt = 0
+    while True:
+        if breaker is not None and not breaker.allow(host):
+            raise SlimleafException(
+                f'Circuit breaker for {host} is open after repeated failures; not sending request '
+                f'to {url}'
+            )
 
-    except ConnectTimeout as conn_tout:
-        raise SlimleafException(f'Connection to {url} timed out. Exception: {conn_tout}')
+        started = perf_counter()
+        try:
+            resp = session.request(method, url, *args, timeout=timeout, verify=False, **kwargs)
 
-    except ConnectionError as conn_err:
-        raise SlimleafException(
-            f'Connection to {url} was refused. Is it available? Exception: {conn_err}'
-        )
+        except ConnectTimeout as conn_tout:
+            _measure(metrics, method, url, started)
+            _record(breaker, host, failed=True)
+            if _can_retry(retry, breaker, method, attempt, host):
+                retry.wait(attempt)
+                attempt += 1
+                continue
+            raise SlimleafException(f'Connection to {url} timed out. Exception: {conn_tout}')
+
+        except ConnectionError as conn_err:
+            _measure(metrics, method, url, started)
+            _record(breaker, host, failed=True)
+            if _can_retry(retry, breaker, method, attempt, host):
+                retry.wait(attempt)
+                attempt += 1
+                continue
+            raise SlimleafException(
+                f'Connection to {url} was refused. Is it available? Exception: {conn_err}'
+            )
+
+        _measure(metrics, method, url, started, resp, streamed=kwargs.get('stream', False))
+        overloaded = resp.status_code != expect and resp.status_code in retry.statuses
+        _record(breaker, host, failed=overloaded)  # Expected statuses never trip the breaker
+        if overloaded and _can_retry(retry, breaker, method, attempt, host):
+            retry.wait(attempt, resp)
+            attempt += 1
+            resp.close()
+            continue
+        break
 
     if resp.status_code != expect:
+        snippet = error_snippet(resp, streamed=kwargs.get('stream', False))
+        resp.close()
         raise SlimleafException(
             FAILED_RQST_MSG.format(
                 exp=expect,
@@ -50,7 +114,130 @@ def validated_request(method, url, expect, desc='', session=None, timeout=30, *a
                 url=url,
                 hdrs=session.headers,
                 body=resp.request.body,
-                resp=resp.text[:500]
+                resp=snippet
             )
         )
     return resp
+
+
+def validated_requests(specs, max_workers=8):
+    """Performs many validated requests concurrently, returning responses in the order given.
+
+    Requests run on a thread pool and share one session, made for the batch and closed after it,
+    whose connection pools keep a connection per worker. Like the shared sessions it keeps no
+    cookies. Every request is allowed to finish before failures are reported, so one Exception
+    describes all of them.
+
+    Args:
+        specs (iterable): RequestSpec(method, url, expect, desc='', kwargs=None) for each request,
+            or dicts with the same keys. kwargs are passed through to `validated_request`, and
+            may name a `session` to use instead.
+        max_workers (int): Maximum number of requests in flight at once
+
+    Returns:
+        responses (list): requests.Response for each spec, in input order
+
+    Raises:
+        SlimleafException: listing every failed request, with the usual failure detail
+    """
+
+    specs = [
+        RequestSpec(**spec) if isinstance(spec, dict) else RequestSpec(*spec) for spec in specs
+    ]
+
+    # Executor threads are new for every batch, so per-thread shared sessions would never be reused
+    session = SESSIONS.new_session(pool_maxsize=max(max_workers, SESSIONS.pool_maxsize))
+
+    def _request(spec):
+        kwargs = {'session': session, **(spec.kwargs or {})}
+        try:
+            return validated_request(
+                spec.method, spec.url, spec.expect, desc=spec.desc, **kwargs
+            ), None
+        except Exception as e:
+            return None, e
+
+    with session, ThreadPoolExecutor(max_workers=max_workers) as executor:
+        outcomes = list(executor.map(_request, specs))
+
+    failures = [
+        f'[{index}] {spec.method} {spec.url}: {exc}'
+        for index, (spec, (_, exc)) in enumerate(zip(specs, outcomes)) if exc is not None
+    ]
+    if failures:
+        raise SlimleafException(
+            f'{len(failures)} of {len(specs)} requests failed:\n\n' + '\n\n'.join(failures)
+        )
+    return [resp for resp, _ in outcomes]
+
+
+def error_snippet(resp, limit=500, streamed=False):
+    """Decode at most `limit` bytes from the start of a response body, for error messages
+
+    Unlike `resp.text[:limit]`, this never decodes (or, for streamed responses, downloads) the rest
+    of the body, and skips requests' character-set detection when no encoding was declared.
+
+    Args:
+        resp (requests.Response)
+        limit (int): Maximum number of bytes to decode
+        streamed (bool): Whether the response was requested with `stream=True` and not yet read
+    """
+
+    if streamed:
+        snippet = b''
+        for chunk in resp.iter_content(chunk_size=limit):
+            snippet += chunk
+            if len(snippet) >= limit:
+                break
+    else:
+        snippet = resp.content
+    try:
+        decoder = getincrementaldecoder(resp.encoding or 'utf-8')(errors='replace')
+    except LookupError:
+        decoder = getincrementaldecoder('utf-8')(errors='replace')
+    return decoder.decode(snippet[:limit])  # Not final: drops a character cut off at the limit
+
+
+def _can_retry(retry, breaker, method, attempt, host):
+    """Retry only while the policy allows it and the host's circuit has not opened"""
+
+    return retry.allows(method, attempt) and (breaker is None or not breaker.is_open(host))
+
+
+def _measure(metrics, method, url, started, resp=None, streamed=False):
+    """Record one attempt; a response of None means no response was received"""
+
+    if metrics is None:
+        return
+    total = perf_counter() - started
+    if resp is None:
+        metrics.record(method, url, 'error', total)
+        return
+
+    body = resp.request.body
+    if isinstance(body, (bytes, str)):
+        sent = len(body)
+    else:  # Streamed uploads (files, generators) cannot be measured; use what was declared
+        sent = int(resp.request.headers.get('Content-Length') or 0)
+    if streamed:
+        received = int(resp.headers.get('Content-Length') or 0)  # Body has not been read yet
+    else:
+        received = len(resp.content)
+    metrics.record(
+        method,
+        url,
+        resp.status_code,
+        total,
+        ttfb=resp.elapsed.total_seconds(),  # requests stops this clock once headers are parsed
+        bytes_sent=sent,
+        bytes_received=received
+    )
+
+
+def _record(breaker, host, failed):
+    if breaker is None:
+        return
+    if failed:
+        breaker.record_failure(host)
+    else:
+        breaker.record_success(host)
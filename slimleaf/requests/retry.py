@@ -0,0 +1,125 @@
+from collections import namedtuple
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+import math
+from threading import Lock
+import random
+import time
+
+
+IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE', 'TRACE'])
+RETRY_STATUSES = frozenset([429, 502, 503, 504])
+
+
+class RetryPolicy(namedtuple(
+        'RetryPolicy', ['retries', 'backoff', 'max_backoff', 'jitter', 'statuses', 'methods'])):
+    """How `validated_request` retries connection failures and overloaded responses
+
+    Attempt n (from 0) waits `backoff * 2**n` seconds, capped at `max_backoff`, scaled by a random
+    factor between 0.5 and 1 when `jitter` is set so that many tests do not retry in lockstep. A
+    `Retry-After` header on the response takes precedence, still capped at `max_backoff`.
+
+    Only `methods` are retried; by default these are the idempotent methods, since a POST that
+    timed out may already have been applied.
+    """
+
+    def allows(self, method, attempt):
+        return attempt < self.retries and method.upper() in self.methods
+
+    def delay(self, attempt, resp=None):
+        retry_after = None
+        if resp is not None:
+            retry_after = retry_after_seconds(resp.headers.get('Retry-After'))
+        if retry_after is not None:
+            return min(retry_after, self.max_backoff)
+
+        delay = min(self.backoff * 2 ** attempt, self.max_backoff)
+        return delay * random.uniform(0.5, 1) if self.jitter else delay
+
+    def wait(self, attempt, resp=None):
+        time.sleep(self.delay(attempt, resp))
+        return None
+
+
+RetryPolicy.__new__.__defaults__ = (3, 0.5, 30, True, RETRY_STATUSES, IDEMPOTENT_METHODS)
+
+DEFAULT_RETRY = RetryPolicy()
+NO_RETRY = RetryPolicy(retries=0)
+
+
+def retry_after_seconds(value):
+    """Seconds to wait according to a Retry-After header (delay-seconds or HTTP-date), or None"""
+
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        pass
+    else:
+        return max(seconds, 0) if math.isfinite(seconds) else None  # e.g. 'nan', 'inf'
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)  # '-0000' dates parse as naive UTC
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0)
+
+
+class CircuitBreaker(object):
+    """Per-host circuit breaker, failing requests fast once a host is clearly down
+
+    After `failure_threshold` consecutive failures the circuit for that host opens and requests
+    are refused without being sent. Once `reset_timeout` seconds have passed, one trial request is
+    let through: success closes the circuit, failure re-opens it.
+
+    `validated_request` counts connection errors and unexpected overload responses (the retry
+    policy's statuses, 429/502/503/504 by default) as failures; expected statuses never are.
+
+    Args:
+        failure_threshold (int): Consecutive failures that open the circuit
+        reset_timeout (float): Seconds the circuit stays open before a trial request
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = {}
+        self._opened_at = {}
+        self._lock = Lock()
+
+    def allow(self, host):
+        """Whether a request to `host` may be sent now"""
+
+        with self._lock:
+            opened_at = self._opened_at.get(host)
+            if opened_at is None:
+                return True
+            if time.monotonic() - opened_at >= self.reset_timeout:
+                self._opened_at[host] = time.monotonic()  # Half-open: one trial per reset_timeout
+                return True
+            return False
+
+    def is_open(self, host):
+        with self._lock:
+            return host in self._opened_at
+
+    def record_success(self, host):
+        with self._lock:
+            self._failures.pop(host, None)
+            self._opened_at.pop(host, None)
+
+    def record_failure(self, host):
+        with self._lock:
+            failures = self._failures[host] = self._failures.get(host, 0) + 1
+            if failures >= self.failure_threshold:
+                self._opened_at[host] = time.monotonic()
+
+    def reset(self):
+        with self._lock:
+            self._failures.clear()
+            self._opened_at.clear()
+
+
+BREAKER = CircuitBreaker()
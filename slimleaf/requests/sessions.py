@@ -0,0 +1,117 @@
+from http.cookiejar import DefaultCookiePolicy
+from threading import Lock, get_ident
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+DEFAULT_POOL_SIZE = 10
+
+
+class SessionRegistry(object):
+    """Shared `requests.Session` objects, one per base URL (scheme and host)
+
+    Reusing a session keeps its connections alive between calls, so repeated requests to the same
+    service skip the TCP and TLS handshakes. Each session mounts an HTTPAdapter whose connection
+    pool holds up to `pool_maxsize` connections per host.
+
+    Shared sessions outlive the test that made a request, so by default they keep no cookies:
+    a login in one test must not authenticate requests in the next. Pass cookies explicitly per
+    request (`cookies=`), or use your own `requests.Session`, when a test needs them. Each thread
+    also gets its own sessions by default, since `requests.Session` is not thread-safe.
+
+    Args:
+        pool_maxsize (int): Maximum connections kept alive per host
+        pool_connections (int): Number of per-host pools cached by each session's adapter
+        per_thread (bool): Whether each thread gets its own session per base URL
+        keep_cookies (bool): Whether sessions store cookies set by responses
+    """
+
+    def __init__(self, pool_maxsize=DEFAULT_POOL_SIZE, pool_connections=DEFAULT_POOL_SIZE,
+                 per_thread=True, keep_cookies=False):
+        self.pool_maxsize = pool_maxsize
+        self.pool_connections = pool_connections
+        self.per_thread = per_thread
+        self.keep_cookies = keep_cookies
+        self._sessions = {}
+        self._lock = Lock()
+
+    def get(self, url):
+        """Session for the base URL of `url`, created on first use"""
+
+        key = self._key(url)
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = self._sessions[key] = self.new_session()
+        return session
+
+    def configure(self, pool_maxsize=None, pool_connections=None, per_thread=None,
+                  keep_cookies=None):
+        """Change pool settings; existing sessions are closed and rebuilt on next use"""
+
+        if pool_maxsize is not None:
+            self.pool_maxsize = pool_maxsize
+        if pool_connections is not None:
+            self.pool_connections = pool_connections
+        if per_thread is not None:
+            self.per_thread = per_thread
+        if keep_cookies is not None:
+            self.keep_cookies = keep_cookies
+        self.close()
+        return None
+
+    def close(self, url=None):
+        """Close the session(s) for one base URL, or every session if no URL is given"""
+
+        with self._lock:
+            if url is None:
+                sessions = list(self._sessions.values())
+                self._sessions.clear()
+            else:
+                base = self._key(url)[0]
+                keys = [key for key in self._sessions if key[0] == base]
+                sessions = [self._sessions.pop(key) for key in keys]
+        for session in sessions:
+            session.close()
+        return None
+
+    def _key(self, url):
+        parts = urlsplit(url)
+        base = f'{parts.scheme}://{parts.netloc}'
+        return (base, get_ident() if self.per_thread else None)
+
+    def new_session(self, pool_maxsize=None):
+        """Session with this registry's settings that is not shared, e.g. for one batch of requests
+
+        Args:
+            pool_maxsize (int): Overrides `pool_maxsize`, e.g. to keep a connection per worker
+        """
+
+        session = requests.Session()
+        if not self.keep_cookies:
+            session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))  # Rejects all
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=pool_maxsize or self.pool_maxsize,
+        )
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+
+SESSIONS = SessionRegistry()
+
+
+def shared_session(url):
+    """Shared, pooled session for the base URL of `url`"""
+
+    return SESSIONS.get(url)
+
+
+def close_sessions():
+    """Close every shared session, e.g. at the end of a test session"""
+
+    SESSIONS.close()
+    return None
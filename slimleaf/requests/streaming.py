@@ -0,0 +1,54 @@
+import hashlib
+
+from slimleaf.requests.requests import validated_request
+
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+def iter_chunks(resp, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield a streamed response body in chunks, releasing the connection when done or abandoned"""
+
+    try:
+        for chunk in resp.iter_content(chunk_size=chunk_size):
+            yield chunk
+    finally:
+        resp.close()
+
+
+def validated_stream(method, url, expect, desc='', chunk_size=DEFAULT_CHUNK_SIZE, **kwargs):
+    """Performs a validated request and returns its body as an iterator of chunks.
+
+    The status code is validated before the body is downloaded, and the body is never held in
+    memory as a whole. Arguments are as for `validated_request`.
+
+    Returns:
+        chunks (generator): bytes chunks of up to `chunk_size`
+    """
+
+    resp = validated_request(method, url, expect, desc=desc, stream=True, **kwargs)
+    return iter_chunks(resp, chunk_size)
+
+
+def hash_response(resp, algorithm='sha256', chunk_size=DEFAULT_CHUNK_SIZE):
+    """Hex digest of a (preferably streamed) response body, computed in constant memory"""
+
+    digest = hashlib.new(algorithm)
+    for chunk in iter_chunks(resp, chunk_size):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def save_response(resp, path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Write a (preferably streamed) response body to `path` in constant memory
+
+    Returns:
+        size (int): Number of bytes written
+    """
+
+    size = 0
+    with open(path, 'wb') as body_file:
+        for chunk in iter_chunks(resp, chunk_size):
+            body_file.write(chunk)
+            size += len(chunk)
+    return size
@@ -0,0 +1,5 @@
+from slimleaf.exceptions import SlimleafException
+
+
+class AttributeNotFoundException(SlimleafException):
+    pass
@@ -0,0 +1,183 @@
+from collections import namedtuple
+
+
+ElementProperties = namedtuple(
+    'ElementProperties', ['text', 'value', 'selected', 'displayed', 'attributes']
+)
+
+
+LocatedElement = namedtuple('LocatedElement', ['web_element', 'properties'])
+
+
+_PROPERTIES_JS = """
+function isDisplayed(el) {
+    if (el.tagName === 'OPTION' || el.tagName === 'OPTGROUP') {
+        var select = el.closest('select');
+        return select ? isDisplayed(select) : false;
+    }
+    for (var node = el; node && node.nodeType === 1; node = node.parentElement) {
+        var style = window.getComputedStyle(node);
+        if (style.display === 'none') { return false; }
+    }
+    var style = window.getComputedStyle(el);
+    if (style.visibility === 'hidden' || style.visibility === 'collapse') { return false; }
+    return el.getClientRects().length > 0;
+}
+
+function readProperties(el, attrs, textContent) {
+    var text = (textContent || el.innerText === undefined) ? el.textContent : el.innerText;
+    var attributes = {};
+    attrs.forEach(function (name) { attributes[name] = el.getAttribute(name); });
+    return {
+        text: (text || '').trim(),
+        value: el.value === undefined ? el.getAttribute('value') : el.value,
+        selected: !!(el.selected || el.checked),
+        displayed: isDisplayed(el),
+        attributes: attributes
+    };
+}
+"""
+
+READ_PROPERTIES_JS = _PROPERTIES_JS + """
+var elems = arguments[0], attrs = arguments[1], textContent = arguments[2];
+return elems.map(function (el) { return readProperties(el, attrs, textContent); });
+"""
+
+FIRST_PRESENT_JS = """
+var xpaths = arguments[0];
+for (var i = 0; i < xpaths.length; i++) {
+    var result = document.evaluate(
+        xpaths[i], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+    );
+    if (result.singleNodeValue) { return i; }
+}
+return -1;
+"""
+
+PREFETCH_JS = _PROPERTIES_JS + """
+var xpaths = arguments[0], many = arguments[1], attrs = arguments[2];
+return xpaths.map(function (xpath, i) {
+    var nodes = [];
+    if (many[i]) {
+        var result = document.evaluate(
+            xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null
+        );
+        for (var j = 0; j < result.snapshotLength; j++) { nodes.push(result.snapshotItem(j)); }
+    } else {
+        var first = document.evaluate(
+            xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+        ).singleNodeValue;
+        if (first) { nodes.push(first); }
+    }
+    return nodes.map(function (el) {
+        return {element: el, properties: readProperties(el, attrs)};
+    });
+});
+"""
+
+REGION_HASH_JS = """
+var node = document.evaluate(
+    arguments[0], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+).singleNodeValue;
+if (!node) { return null; }
+var html = node.outerHTML || node.textContent, hash = 0;
+for (var i = 0; i < html.length; i++) { hash = (hash * 31 + html.charCodeAt(i)) | 0; }
+return hash + ':' + html.length;
+"""
+
+
+def read_properties(driver, web_elements, attributes=(), text_content=False):
+    """Read common properties of many elements in a single `execute_script` round trip
+
+    Reading `.text`, `is_selected()`, etc. from each element costs one remote call per element and
+    property. This gathers all of them in the browser at once.
+
+    Args:
+        driver (selenium.webdriver): Webdriver the elements belong to
+        web_elements (list): selenium-level WebElements to read
+        attributes (iterable): names of additional attributes to read from every element
+        text_content (bool): Read each element's `textContent`, hidden text included, rather than
+            its rendered `innerText`; this matches the text of the element in an html_tree
+
+    Returns:
+        properties (list): ElementProperties for each element, in the order given
+    """
+
+    web_elements = list(web_elements)
+    if not web_elements:
+        return []
+
+    results = driver.execute_script(
+        READ_PROPERTIES_JS, web_elements, list(attributes), text_content
+    )
+    properties = [_properties(result) for result in results]
+    return properties
+
+
+def first_present(driver, xpaths):
+    """Index of the first XPath expression matching any element, checked in one round trip
+
+    Args:
+        driver (selenium.webdriver): Webdriver to evaluate the expressions in
+        xpaths (list): XPath expressions, e.g. from slimleaf.webdriver.selectors.xpath_for
+
+    Returns:
+        index (int): Position of the first matching expression, or None if none match
+    """
+
+    index = driver.execute_script(FIRST_PRESENT_JS, list(xpaths))
+    return index if index is not None and index >= 0 else None
+
+
+def prefetch(driver, xpaths, many=None, attributes=()):
+    """Locate the elements matching many XPath expressions, and read their common properties, in a
+    single round trip
+
+    Args:
+        driver (selenium.webdriver): Webdriver to evaluate the expressions in
+        xpaths (list): XPath expressions, e.g. from slimleaf.webdriver.selectors.xpath_for
+        many (list): For each expression, whether every match is wanted rather than just the first
+        attributes (iterable): names of additional attributes to read from every element
+
+    Returns:
+        located (list): list of LocatedElement(web_element, properties) for each expression, in
+            the order given
+    """
+
+    xpaths = list(xpaths)
+    if not xpaths:
+        return []
+    many = list(many) if many is not None else [False] * len(xpaths)
+
+    results = driver.execute_script(PREFETCH_JS, xpaths, many, list(attributes))
+    located = [
+        [LocatedElement(match['element'], _properties(match['properties'])) for match in matches]
+        for matches in results
+    ]
+    return located
+
+
+def region_hash(driver, xpath):
+    """Hash of the markup of the first element matching an XPath, computed in the browser
+
+    Lets a caller watch one region for changes without transferring the full page source.
+
+    Args:
+        driver (selenium.webdriver): Webdriver to evaluate the expression in
+        xpath (str): XPath expression, e.g. from slimleaf.webdriver.selectors.xpath_for
+
+    Returns:
+        digest (str): Hash of the region's outerHTML, or None if nothing matches
+    """
+
+    return driver.execute_script(REGION_HASH_JS, xpath)
+
+
+def _properties(result):
+    return ElementProperties(
+        text=result['text'],
+        value=result['value'],
+        selected=result['selected'],
+        displayed=result['displayed'],
+        attributes=result['attributes'],
+    )
@@ -0,0 +1,88 @@
+from functools import lru_cache
+
+from cssselect import HTMLTranslator, SelectorError
+from lxml import etree
+from lxml.cssselect import CSSSelector
+from selenium.webdriver.common.by import By
+
+from slimleaf.exceptions import SlimleafException
+
+
+SUPPORTED_BYS = [By.CSS_SELECTOR, By.XPATH]
+SELECTOR_CACHE_SIZE = 1024
+
+_translator = HTMLTranslator()
+
+
+@lru_cache(maxsize=SELECTOR_CACHE_SIZE)
+def compiled_selector(locator):
+    """Compile an etree locator into a reusable lxml selector
+
+    CSS selectors are translated to XPath and XPath expressions are compiled once per locator for
+    the life of the process, rather than on every lookup. The cache is a bounded LRU; use
+    `compiled_selector.cache_info()` to inspect it.
+
+    Args:
+        locator (slimleaf.webdriver.locator.Locator): CSS or XPath etree locator
+
+    Returns:
+        selector (lxml.etree.XPath): callable taking a tree and returning a list of matches
+    """
+
+    by, value = locator
+    if by == By.CSS_SELECTOR:
+        return CSSSelector(value, translator='html')
+    elif by == By.XPATH:
+        return etree.XPath(value)
+    raise SlimleafException(
+        f"Etree locator {by} not supported. Supported by's are {SUPPORTED_BYS}"
+    )
+
+
+@lru_cache(maxsize=SELECTOR_CACHE_SIZE)
+def xpath_for(locator):
+    """Express a locator as an equivalent XPath expression, where one exists
+
+    Args:
+        locator (slimleaf.webdriver.locator.Locator): CSS, XPath, id, name, class name or tag name
+            locator
+
+    Returns:
+        xpath (str): equivalent XPath expression, or None if the locator cannot be expressed, e.g.
+            CSS that browsers accept but cssselect cannot translate (`a::before`)
+    """
+
+    try:
+        return _xpath_for(locator)
+    except SelectorError:
+        return None
+
+
+def _xpath_for(locator):
+    by, value = locator
+    if by == By.XPATH:
+        return value
+    elif by == By.CSS_SELECTOR:
+        return _translator.css_to_xpath(value)
+    elif by == By.ID:
+        return _translator.css_to_xpath(f'[id={_quoted(value)}]')
+    elif by == By.NAME:
+        return _translator.css_to_xpath(f'[name={_quoted(value)}]')
+    elif by == By.CLASS_NAME:
+        return _translator.css_to_xpath(f'.{value}')
+    elif by == By.TAG_NAME:
+        return _translator.css_to_xpath(value)
+    return None
+
+
+def normalized_text(txt):
+    """Text with surrounding whitespace removed and inner runs of whitespace collapsed, as
+    compared by text filters
+    """
+
+    return ' '.join((txt or '').split())
+
+
+def _quoted(value):
+    escaped = value.replace('\\', '\\\\').replace('"', '\\"')
+    return f'"{escaped}"'
@@ -0,0 +1,113 @@
+from weakref import WeakKeyDictionary
+
+from lxml import etree
+from selenium.webdriver.common.by import By
+
+from slimleaf.webdriver.locator import Locator
+
+
+class SnapshotCache(object):
+    """Parsed copy of a driver's page source, reused until the DOM is known to have changed.
+
+    Fetching `page_source` is a full transfer of the document over the wire, and parsing it is
+    proportional to its size. A snapshot is taken on first use and shared by every lookup until
+    it is invalidated by navigation, an element interaction, or an explicit call.
+
+    Attributes:
+        previous (lxml.etree.Element): The snapshot most recently invalidated, kept for diffing
+        hits (int): Number of lookups served from the cached tree
+        misses (int): Number of lookups that required fetching and parsing the page source
+        generation (int): Number of snapshots taken so far; compare against the value read when
+            elements were located to tell whether the current tree was parsed after them
+    """
+
+    def __init__(self):
+        self.tree = None
+        self.previous = None
+        self.hits = 0
+        self.misses = 0
+        self.generation = 0
+
+    def get_tree(self, driver):
+        if self.tree is None:
+            self.misses += 1
+            self.generation += 1
+            parser = etree.HTMLParser(encoding='utf-8')
+            xml = driver.page_source.encode('utf-8')
+            self.tree = etree.fromstring(xml, parser=parser)
+        else:
+            self.hits += 1
+        return self.tree
+
+    def invalidate(self):
+        if self.tree is not None:
+            self.previous = self.tree
+        self.tree = None
+        return None
+
+    @property
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses}
+
+
+def diff_trees(old, new):
+    """Subtrees of `new` that differ from `old`, compared top-down
+
+    Each element is compared on its own tag, attributes, text, and its children's tags and tails;
+    where those match, the comparison descends into the children pair by pair, so unchanged regions
+    cost one comparison per element and the result names the smallest subtrees that changed. An
+    element whose children were added, removed or reordered is reported whole.
+
+    Args:
+        old (lxml.etree.Element): Earlier snapshot, e.g. from `Page.html_tree`
+        new (lxml.etree.Element): Later snapshot of the same page
+
+    Returns:
+        changes (dict): map of XPath etree locators (slimleaf.webdriver.locator.Locator) to the
+            changed subtrees of `new`, in document order
+    """
+
+    changes = {}
+    new_tree = new.getroottree()
+    pending = [(old, new)]
+    while pending:
+        old_elem, new_elem = pending.pop()
+        if _signature(old_elem) != _signature(new_elem):
+            changes[Locator(By.XPATH, new_tree.getpath(new_elem))] = new_elem
+        else:
+            pending.extend(reversed(list(zip(old_elem, new_elem))))
+    return changes
+
+
+def _signature(elem):
+    return (
+        elem.tag,
+        dict(elem.attrib),
+        elem.text,
+        [(child.tag, child.tail) for child in elem],
+    )
+
+
+_caches = WeakKeyDictionary()
+
+
+def snapshot_cache(driver):
+    """Retrieve the snapshot cache belonging to a driver, creating it if necessary
+
+    Snapshots are held per driver rather than per page so that every page and element sharing a
+    browser session sees the same invalidations.
+    """
+
+    cache = _caches.get(driver)
+    if cache is None:
+        cache = _caches[driver] = SnapshotCache()
+    return cache
+
+
+def invalidate_snapshot(driver):
+    """Discard the cached snapshot for a driver, if one exists"""
+
+    cache = _caches.get(driver)
+    if cache is not None:
+        cache.invalidate()
+    return None
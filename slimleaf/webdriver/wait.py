@@ -0,0 +1,141 @@
+from collections import defaultdict, namedtuple
+from threading import Lock
+import time
+
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+
+
+class PollSchedule(namedtuple('PollSchedule', ['initial', 'factor', 'maximum'])):
+    """Backoff schedule for polling a wait condition
+
+    The first poll happens immediately; subsequent polls are spaced `initial` seconds apart,
+    growing by `factor` each time up to `maximum`. Conditions that are met shortly after a poll are
+    therefore noticed within milliseconds, while long waits settle at a modest polling rate.
+    """
+
+    def intervals(self):
+        interval = self.initial
+        while True:
+            yield interval
+            interval = min(interval * self.factor, self.maximum)
+
+
+DEFAULT_SCHEDULE = PollSchedule(initial=0.025, factor=2, maximum=0.5)
+_default_schedule = DEFAULT_SCHEDULE
+
+
+def set_default_schedule(schedule):
+    """Change the PollSchedule used by every Slimleaf wait that does not specify its own"""
+
+    global _default_schedule
+    _default_schedule = schedule or DEFAULT_SCHEDULE
+    return None
+
+
+class WaitStats(object):
+    """Thread-safe tally of waits, condition polls, timeouts and time spent waiting, per call site
+
+    Every Slimleaf wait is attributed to a call site name (e.g. 'element.click'), so the number of
+    remote round trips and the time spent waiting can be compared before and after a change.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._sites = defaultdict(lambda: {'waits': 0, 'polls': 0, 'timeouts': 0, 'seconds': 0.0})
+
+    def record_wait(self, site):
+        with self._lock:
+            self._sites[site]['waits'] += 1
+
+    def record_poll(self, site):
+        with self._lock:
+            self._sites[site]['polls'] += 1
+
+    def record_result(self, site, seconds, timed_out=False):
+        with self._lock:
+            self._sites[site]['seconds'] += seconds
+            if timed_out:
+                self._sites[site]['timeouts'] += 1
+
+    def snapshot(self):
+        """Copy of the current statistics, e.g. {'element.click': {'waits': 3, 'polls': 4, ...}}"""
+
+        with self._lock:
+            return {site: dict(counts) for site, counts in self._sites.items()}
+
+    def reset(self):
+        with self._lock:
+            self._sites.clear()
+
+
+WAIT_STATS = WaitStats()
+
+
+class SmartWait(object):
+    """Central wait engine used by every Slimleaf wait
+
+    A drop-in for Selenium's `WebDriverWait(...).until(...)` that polls on a backoff schedule
+    instead of a fixed half second, and records statistics for its call site in WAIT_STATS.
+
+    Args:
+        driver (selenium.webdriver): Webdriver passed to the wait condition
+        timeout (float): Duration (seconds) to wait before a TimeoutException is raised
+        site (str): Name the wait's statistics are recorded under
+        schedule (PollSchedule): Polling schedule; defaults to the module-wide default schedule
+        ignored_exceptions (iterable): Exceptions treated as "not yet" while polling
+    """
+
+    def __init__(self, driver, timeout, site='wait', schedule=None, ignored_exceptions=None):
+        self.driver = driver
+        self.timeout = timeout
+        self.site = site
+        self.schedule = schedule or _default_schedule
+        self.ignored_exceptions = tuple(ignored_exceptions or (NoSuchElementException,))
+
+    def until(self, method, message=''):
+        """Poll `method(driver)` until it returns a truthy value, which is returned
+
+        Raises:
+            TimeoutException: if the condition is not met within the timeout
+        """
+
+        WAIT_STATS.record_wait(self.site)
+        start = time.monotonic()
+        end_time = start + self.timeout
+        intervals = self.schedule.intervals()
+        screen = stacktrace = None
+        timed_out = False
+
+        try:
+            while True:
+                WAIT_STATS.record_poll(self.site)
+                try:
+                    value = method(self.driver)
+                    if value:
+                        return value
+                except self.ignored_exceptions as exc:
+                    screen = getattr(exc, 'screen', None)
+                    stacktrace = getattr(exc, 'stacktrace', None)
+
+                remaining = end_time - time.monotonic()
+                if remaining <= 0:
+                    timed_out = True
+                    raise TimeoutException(message, screen, stacktrace)
+                time.sleep(min(next(intervals), remaining))
+        finally:
+            WAIT_STATS.record_result(self.site, time.monotonic() - start, timed_out)
+
+
+def element_clickable(web_element):
+    """Wait condition: an already-located element is displayed and enabled
+
+    Unlike Selenium's `element_to_be_clickable` with a locator, this does not re-query the DOM. A
+    StaleElementReferenceException is allowed to propagate so callers can re-locate the element.
+    """
+
+    def _condition(driver):
+        if web_element.is_displayed() and web_element.is_enabled():
+            return web_element
+        return False
+
+    return _condition
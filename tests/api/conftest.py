@@ -0,0 +1,68 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+
+from pytest import fixture
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Local stand-in API
+
+    `/status/<code>` responds with that status, `/flaky/<n>` with 503 (Retry-After: 1) for its
+    first n requests, and anything else with 200. `/bytes/<n>` responds with n bytes, and
+    `/cookie` sets a cookie and echoes the Cookie header it received; other bodies echo the request
+    body, or the request line.
+    """
+
+    protocol_version = 'HTTP/1.1'
+    connections = 0
+    hits = {}
+
+    def setup(self):
+        super().setup()
+        type(self).connections += 1
+
+    def _respond(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        request_body = self.rfile.read(length) if length else b''
+
+        hits = type(self).hits[self.path] = type(self).hits.get(self.path, 0) + 1
+        parts = self.path.strip('/').split('/')
+        status = 200
+        if parts[0] == 'status':
+            status = int(parts[1])
+        elif parts[0] == 'flaky' and hits <= int(parts[1]):
+            status = 503
+        if parts[0] == 'bytes':
+            body = bytes(i % 256 for i in range(int(parts[1])))
+        elif parts[0] == 'cookie':
+            body = (self.headers.get('Cookie') or '').encode()
+        else:
+            body = request_body or f'{self.command} {self.path}'.encode()
+
+        self.send_response(status)
+        if status == 503:
+            self.send_header('Retry-After', '1')
+        if parts[0] == 'cookie':
+            self.send_header('Set-Cookie', 'session=abc; Path=/')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = do_PUT = do_DELETE = _respond
+
+    def log_message(self, *args):
+        pass
+
+
+@fixture(scope='function')
+def api_server():
+    StandInHandler.connections = 0
+    StandInHandler.hits = {}
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+    server.daemon_threads = True
+    Thread(target=server.serve_forever, daemon=True).start()
+    server.base_url = f'http://127.0.0.1:{server.server_port}'
+    server.handler = StandInHandler
+    yield server
+    server.shutdown()
+    server.server_close()
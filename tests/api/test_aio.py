@@ -0,0 +1,51 @@
+import asyncio
+
+from pytest import fixture, raises, skip
+
+from slimleaf.exceptions import SlimleafException
+from slimleaf.requests import aio, close_sessions
+
+
+@fixture(scope='function', params=['aiohttp', 'executor'])
+def backend(request, monkeypatch):
+    if request.param == 'executor':
+        monkeypatch.setattr(aio, 'aiohttp', None)
+    elif aio.aiohttp is None:
+        skip('aiohttp is not installed')
+    yield request.param
+    close_sessions()
+
+
+def test_async_validated_request(api_server, backend):
+    async def _run():
+        resp = await aio.validated_request('GET', f'{api_server.base_url}/plans', 200)
+        assert resp.text == 'GET /plans'
+
+        with raises(SlimleafException) as failed_exc:
+            await aio.validated_request(
+                'POST', f'{api_server.base_url}/status/409', 201, desc='Create plan', data=b'dupe'
+            )
+        assert 'Expected a response of 201, got 409' in str(failed_exc.value)
+        assert 'Create plan' in str(failed_exc.value)
+        await aio.close_sessions()
+
+    asyncio.run(_run())
+
+
+def test_async_validated_requests_limit_and_reuse(api_server, backend):
+    async def _run():
+        specs = [
+            ('POST', f'{api_server.base_url}/plans', 200, '', {'data': f'plan{i}'.encode()})
+            for i in range(12)
+        ]
+        responses = await aio.validated_requests(specs, limit=3)
+        assert [resp.text for resp in responses] == [f'plan{i}' for i in range(12)]
+        assert api_server.handler.connections <= 3
+
+        specs.append(('GET', f'{api_server.base_url}/status/503', 200, 'Read plan'))
+        with raises(SlimleafException) as failed_exc:
+            await aio.validated_requests(specs)
+        assert '1 of 13 requests failed' in str(failed_exc.value)
+        await aio.close_sessions()
+
+    asyncio.run(_run())
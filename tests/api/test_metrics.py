@@ -0,0 +1,63 @@
+import io
+import json
+
+from slimleaf.requests import MetricsRegistry, close_sessions, validated_request
+from slimleaf.requests.metrics import Histogram, template_path
+
+
+def test_template_path_groups_ids():
+    assert template_path('http://h/users/123/orders/9f86d081884c7d65?page=2') == \
+        '/users/{id}/orders/{hex}'
+    assert template_path('http://h/items/123e4567-e89b-12d3-a456-426614174000') == '/items/{uuid}'
+    assert template_path('http://h') == '/'
+
+
+def test_histogram_quantiles_within_precision():
+    histogram = Histogram()
+    for millis in range(1, 1001):
+        histogram.record(millis / 1000)
+
+    assert histogram.count == 1000
+    assert abs(histogram.quantile(0.5) - 0.5) / 0.5 < 0.02
+    assert abs(histogram.quantile(0.99) - 0.99) / 0.99 < 0.02
+    assert abs(histogram.quantile(1) - 1.0) < 0.01
+    assert len(histogram._buckets) < 1000
+
+
+def test_requests_are_recorded_per_endpoint(api_server):
+    metrics = MetricsRegistry()
+    for user in range(3):
+        validated_request('POST', f'{api_server.base_url}/users/{user}', 200, data=b'hello',
+                          metrics=metrics)
+    validated_request('GET', f'{api_server.base_url}/status/404', 404, metrics=metrics)
+    close_sessions()
+
+    recorded = json.loads(metrics.to_json())
+    users = recorded['POST /users/{id}']
+    assert users['total_seconds']['count'] == 3
+    assert users['ttfb_seconds']['count'] == 3
+    assert users['statuses'] == {'200': 3}
+    assert users['bytes_sent'] == 15
+    assert users['bytes_received'] == 15
+    assert recorded['GET /status/{id}']['statuses'] == {'404': 1}
+
+    exposition = metrics.to_prometheus()
+    assert 'slimleaf_requests_total{method="POST",endpoint="/users/{id}",status="200"} 3' in \
+        exposition
+    assert 'slimleaf_request_duration_seconds_count{method="POST",endpoint="/users/{id}"} 3' in \
+        exposition
+
+    metrics.reset()
+    assert metrics.to_dict() == {}
+
+
+def test_streamed_uploads_are_recorded(api_server):
+    metrics = MetricsRegistry()
+    url = f'{api_server.base_url}/uploads'
+    validated_request('POST', url, 200, data=io.BytesIO(b'abc'), metrics=metrics)
+    validated_request('POST', url, 200, data=(chunk for chunk in [b'ab', b'c']), metrics=metrics)
+    close_sessions()
+
+    uploads = metrics.to_dict()['POST /uploads']
+    assert uploads['statuses'] == {'200': 2}
+    assert uploads['bytes_sent'] == 3  # Chunked generator bodies declare no length
@@ -0,0 +1,90 @@
+from pytest import raises
+
+from slimleaf.exceptions import SlimleafException
+from slimleaf.requests import (
+    SESSIONS, RequestSpec, close_sessions, shared_session, validated_request, validated_requests
+)
+from slimleaf.requests.sessions import SessionRegistry
+
+
+def test_validated_request(api_server):
+    resp = validated_request('GET', f'{api_server.base_url}/plans', 200, desc='List plans')
+    assert resp.text == 'GET /plans'
+
+    with raises(SlimleafException) as failed_exc:
+        validated_request('GET', f'{api_server.base_url}/status/404', 200, desc='Find a plan')
+    assert 'Expected a response of 200, got 404' in str(failed_exc.value)
+    assert 'Find a plan' in str(failed_exc.value)
+    close_sessions()
+
+
+def test_requests_share_pooled_sessions(api_server):
+    url = f'{api_server.base_url}/plans'
+    assert shared_session(url) is shared_session(f'{api_server.base_url}/other?q=1')
+    assert shared_session(url) is not shared_session('http://elsewhere.test/plans')
+
+    for _ in range(5):
+        validated_request('GET', url, 200)
+    assert api_server.handler.connections == 1  # Kept alive and reused
+
+    close_sessions()
+    validated_request('GET', url, 200)
+    assert api_server.handler.connections == 2
+    close_sessions()
+
+
+def test_session_registry_configuration():
+    registry = SessionRegistry(pool_maxsize=3, per_thread=True)
+    session = registry.get('https://api.test/a')
+    assert session.get_adapter('https://api.test/a')._pool_maxsize == 3
+
+    registry.configure(pool_maxsize=5)
+    assert registry.get('https://api.test/a') is not session
+    assert SESSIONS.per_thread is True
+    registry.close()
+
+
+def test_shared_sessions_do_not_carry_cookies_between_tests(api_server):
+    url = f'{api_server.base_url}/cookie'
+    assert validated_request('GET', url, 200).cookies['session'] == 'abc'
+    assert validated_request('GET', url, 200).text == ''  # e.g. a login leaking into later tests
+    assert validated_request('GET', url, 200, cookies={'session': 'mine'}).text == 'session=mine'
+
+    registry = SessionRegistry(keep_cookies=True)
+    session = registry.get(url)
+    session.get(url)
+    assert session.get(url).text == 'session=abc'
+    registry.close()
+    close_sessions()
+
+
+def test_validated_requests_fan_out_in_order(api_server):
+    specs = [
+        RequestSpec('POST', f'{api_server.base_url}/plans/{i}', 200, kwargs={'data': f'plan{i}'})
+        for i in range(20)
+    ]
+    responses = validated_requests(specs, max_workers=4)
+    assert [resp.text for resp in responses] == [f'plan{i}' for i in range(20)]
+
+    specs = [
+        {'method': 'GET', 'url': f'{api_server.base_url}/plans', 'expect': 200},
+        ('GET', f'{api_server.base_url}/status/500', 200, 'Read plan 1'),
+        ('GET', f'{api_server.base_url}/status/404', 200, 'Read plan 2'),
+    ]
+    with raises(SlimleafException) as failed_exc:
+        validated_requests(specs)
+    message = str(failed_exc.value)
+    assert '2 of 3 requests failed' in message
+    assert '[1] GET' in message and 'Read plan 1' in message and 'got 500' in message
+    assert '[2] GET' in message and 'Read plan 2' in message and 'got 404' in message
+    close_sessions()
+
+
+def test_validated_requests_share_one_session_per_batch(api_server):
+    close_sessions()
+    specs = [('GET', f'{api_server.base_url}/cookie', 200) for _ in range(12)]
+
+    responses = validated_requests(specs, max_workers=4)
+    assert [resp.text for resp in responses] == [''] * 12  # No cookies carried between requests
+    assert api_server.handler.connections <= 4
+    assert SESSIONS._sessions == {}  # Worker threads leave no shared sessions behind
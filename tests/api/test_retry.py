@@ -0,0 +1,85 @@
+import socket
+from unittest.mock import patch
+
+from pytest import raises
+
+from slimleaf.exceptions import SlimleafException
+from slimleaf.requests import (
+    NO_RETRY, CircuitBreaker, RetryPolicy, close_sessions, validated_request
+)
+from slimleaf.requests.retry import retry_after_seconds
+
+
+def _closed_port_url():
+    sock = socket.socket()
+    sock.bind(('127.0.0.1', 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return f'http://127.0.0.1:{port}/plans'
+
+
+def test_retry_policy_backoff():
+    policy = RetryPolicy(retries=3, backoff=0.5, max_backoff=3, jitter=False)
+    assert [policy.delay(attempt) for attempt in range(4)] == [0.5, 1, 2, 3]
+    assert 0.25 <= RetryPolicy(backoff=0.5).delay(0) <= 0.5
+
+    assert policy.allows('get', 2) and not policy.allows('GET', 3)
+    assert not policy.allows('POST', 0)
+
+    assert retry_after_seconds('7') == 7
+    assert retry_after_seconds('Wed, 21 Oct 2015 07:28:00 GMT') == 0
+    assert retry_after_seconds('soon') is None
+    assert retry_after_seconds('Wed, 21 Oct 2015 07:28:00 -0000') == 0  # Naive, read as UTC
+    assert retry_after_seconds('nan') is None
+    assert retry_after_seconds('inf') is None
+
+
+@patch('slimleaf.requests.retry.time.sleep')
+def test_overloaded_responses_are_retried(_mock_sleep, api_server):
+    resp = validated_request('GET', f'{api_server.base_url}/flaky/2', 200)
+    assert resp.status_code == 200
+    assert [c[0][0] for c in _mock_sleep.call_args_list] == [1, 1]  # Honours Retry-After
+
+    # Non-idempotent methods are not retried by default
+    with raises(SlimleafException) as failed_exc:
+        validated_request('POST', f'{api_server.base_url}/flaky/1', 201)
+    assert 'got 503' in str(failed_exc.value)
+
+    with raises(SlimleafException):
+        validated_request('GET', f'{api_server.base_url}/flaky/5', 200, retry=NO_RETRY)
+    close_sessions()
+
+
+@patch('slimleaf.requests.retry.time.sleep')
+def test_circuit_breaker_fails_fast(_mock_sleep):
+    url = _closed_port_url()
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+
+    with raises(SlimleafException) as refused_exc:
+        validated_request('GET', url, 200, retry=RetryPolicy(retries=5), breaker=breaker)
+    assert 'was refused' in str(refused_exc.value)  # Retries stop once the circuit opens
+    assert _mock_sleep.call_count == 2
+
+    with raises(SlimleafException) as open_exc:
+        validated_request('GET', url, 200, breaker=breaker)
+    assert 'Circuit breaker' in str(open_exc.value)
+
+    host = url.split('/')[2]
+    assert not breaker.allow(host)
+    breaker.reset_timeout = 0
+    assert breaker.allow(host)  # Half-open: one trial request
+    breaker.record_success(host)
+    assert not breaker.is_open(host)
+
+
+def test_expected_server_errors_do_not_trip_the_breaker(api_server):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+    for _ in range(6):
+        validated_request('GET', f'{api_server.base_url}/status/500', 500, breaker=breaker)
+    for _ in range(4):  # Unexpected, but not an overload status
+        with raises(SlimleafException) as failed_exc:
+            validated_request('GET', f'{api_server.base_url}/status/500', 200, breaker=breaker)
+        assert 'got 500' in str(failed_exc.value)
+    assert not breaker.is_open(api_server.base_url.split('/')[2])
+    assert validated_request('GET', f'{api_server.base_url}/healthy', 200, breaker=breaker)
+    close_sessions()
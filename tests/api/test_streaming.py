@@ -0,0 +1,37 @@
+import hashlib
+from unittest.mock import MagicMock
+
+from slimleaf.requests import (
+    close_sessions, hash_response, save_response, validated_request, validated_stream
+)
+from slimleaf.requests.requests import error_snippet
+
+BODY = bytes(i % 256 for i in range(200000))
+
+
+def test_streamed_bodies_in_constant_memory(api_server, tmp_path):
+    url = f'{api_server.base_url}/bytes/{len(BODY)}'
+
+    chunks = list(validated_stream('GET', url, 200, chunk_size=65536))
+    assert max(len(chunk) for chunk in chunks) <= 65536
+    assert b''.join(chunks) == BODY
+
+    resp = validated_request('GET', url, 200, stream=True)
+    assert hash_response(resp) == hashlib.sha256(BODY).hexdigest()
+
+    resp = validated_request('GET', url, 200, stream=True)
+    assert save_response(resp, tmp_path / 'export.csv') == len(BODY)
+    assert (tmp_path / 'export.csv').read_bytes() == BODY
+    close_sessions()
+
+
+def test_error_snippet_reads_only_what_it_needs():
+    resp = MagicMock(encoding=None)
+    resp.iter_content.return_value = iter([b'a' * 300, b'\xe2\x9c\x93' * 100, b'never read'])
+
+    snippet = error_snippet(resp, limit=500, streamed=True)
+    assert snippet.startswith('a' * 300) and len(snippet.encode()) <= 500
+    assert next(resp.iter_content.return_value) == b'never read'
+
+    resp = MagicMock(encoding='latin-1', content=b'\xe9' * 1000)
+    assert error_snippet(resp, limit=5) == '\xe9' * 5
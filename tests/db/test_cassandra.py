@@ -0,0 +1,63 @@
+from unittest.mock import MagicMock, patch
+
+from pytest import raises
+
+from slimleaf.db import (
+    cassandra_connection, cassandra_execute_concurrent, cassandra_query, close_cassandra_sessions,
+    prepared_statement
+)
+from slimleaf.exceptions import SlimleafException
+
+
+@patch('slimleaf.db.db.Cluster')
+def test_cassandra_sessions_are_shared(_mock_cluster):
+    _mock_cluster.return_value.connect.side_effect = lambda key: MagicMock(is_shutdown=False)
+
+    session = cassandra_connection('user', 'pw', '127.0.0.1', 'keyspace')
+    assert cassandra_connection('user', 'pw', '127.0.0.1', 'keyspace') is session
+    assert cassandra_connection('user', 'pw', '127.0.0.1', 'other') is not session
+    assert cassandra_connection('user', 'pw', '127.0.0.1', 'keyspace', cached=False) is not session
+    assert _mock_cluster.call_count == 3
+
+    session.is_shutdown = True
+    replacement = cassandra_connection('user', 'pw', '127.0.0.1', 'keyspace')
+    assert replacement is not session
+
+    close_cassandra_sessions()
+    replacement.cluster.shutdown.assert_called_once()
+    assert cassandra_connection('user', 'pw', '127.0.0.1', 'keyspace') is not replacement
+    close_cassandra_sessions()
+
+
+def test_cassandra_query_prepares_once_and_pages():
+    session = MagicMock()
+    session.execute.return_value = iter(['row1', 'row2'])
+
+    rows = cassandra_query(session, 'SELECT * FROM plans WHERE id = ?', [1], fetch_size=100)
+    assert list(rows) == ['row1', 'row2']
+
+    statement = session.prepare.return_value
+    statement.bind.assert_called_once_with([1])
+    assert statement.bind.return_value.fetch_size == 100
+
+    assert prepared_statement(session, 'SELECT * FROM plans WHERE id = ?') is statement
+    session.prepare.assert_called_once()
+
+
+@patch('slimleaf.db.db.execute_concurrent_with_args')
+def test_cassandra_execute_concurrent(_mock_execute):
+    session = MagicMock()
+    qry = 'INSERT INTO plans (id) VALUES (?)'
+
+    _mock_execute.return_value = [(True, 'ok1'), (True, 'ok2')]
+    assert cassandra_execute_concurrent(session, qry, [[1], [2]], concurrency=10) == ['ok1', 'ok2']
+    _mock_execute.assert_called_once_with(
+        session, session.prepare.return_value, [[1], [2]], concurrency=10,
+        raise_on_first_error=False
+    )
+
+    _mock_execute.return_value = [(True, 'ok1'), (False, ValueError('boom'))]
+    with raises(SlimleafException) as concurrent_exc:
+        cassandra_execute_concurrent(session, qry, [[1], [2]])
+    assert '1 of 2 executions failed' in str(concurrent_exc.value)
+    assert "[2]: ValueError('boom')" in str(concurrent_exc.value)
@@ -0,0 +1,190 @@
+from unittest.mock import create_autospec
+
+from pymysql.connections import Connection as MySQLConnection
+from pymysql.cursors import SSCursor
+from pymysql.err import ProgrammingError
+from pytest import fixture, raises
+
+from slimleaf.db import (
+    QUERY_CACHE, ChunkResult, ConnectionPool, QueryCache, bulk_update_db, get_sqlite3_conx,
+    query_result, stream_query, update_db
+)
+from slimleaf.exceptions import SlimleafException
+
+
+@fixture(scope='function')
+def sqlite_cxn():
+    cxn = get_sqlite3_conx(':memory:')
+    update_db(cxn, 'CREATE TABLE plans (id INTEGER PRIMARY KEY, name TEXT)')
+    yield cxn
+    cxn.close()
+
+
+def test_query_and_update(sqlite_cxn):
+    last_id = update_db(sqlite_cxn, 'INSERT INTO plans (name) VALUES (?)', ['basic'])
+    assert query_result(sqlite_cxn, 'SELECT id, name FROM plans') == [(last_id, 'basic')]
+    assert query_result(sqlite_cxn, 'SELECT name FROM plans', single_row=True) == ('basic',)
+
+    with raises(SlimleafException):
+        query_result(sqlite_cxn, 'SELECT name FROM plans WHERE id = ?', [last_id + 1])
+    assert query_result(sqlite_cxn, 'SELECT name FROM plans WHERE id = 0', empty_results=True) == []
+
+
+def test_query_and_update_accept_pools(sqlite_cxn):
+    pool = ConnectionPool(lambda: sqlite_cxn, max_size=1)
+
+    update_db(pool, 'INSERT INTO plans (name) VALUES (?)', ['pro'])
+    assert query_result(pool, 'SELECT name FROM plans') == [('pro',)]
+    assert (pool.size, pool.idle) == (1, 1)
+
+
+def test_stream_query_yields_rows_and_batches(sqlite_cxn):
+    for name in ['a', 'b', 'c']:
+        update_db(sqlite_cxn, 'INSERT INTO plans (name) VALUES (?)', [name])
+
+    rows = stream_query(sqlite_cxn, 'SELECT name FROM plans ORDER BY id', batch_size=2)
+    assert list(rows) == [('a',), ('b',), ('c',)]
+
+    batches = stream_query(
+        sqlite_cxn, 'SELECT name FROM plans ORDER BY id', batch_size=2, batches=True
+    )
+    assert list(batches) == [[('a',), ('b',)], [('c',)]]
+
+    with raises(SlimleafException):
+        next(stream_query(sqlite_cxn, 'SELECT name FROM plans WHERE id = 0'))
+    empty = stream_query(sqlite_cxn, 'SELECT name FROM plans WHERE id = 0', empty_results=True)
+    assert list(empty) == []
+
+
+def test_stream_query_abandons_unbuffered_mysql_results():
+    cxn = create_autospec(MySQLConnection, instance=True)
+    curs = cxn.cursor.return_value
+    curs.fetchmany.side_effect = [[(1,), (2,)], [(3,)], []]
+
+    rows = stream_query(ConnectionPool(lambda: cxn), 'SELECT id FROM audit', batch_size=2)
+    assert next(rows) == (1,)
+    cxn.cursor.assert_called_once_with(SSCursor)
+
+    rows.close()
+    cxn.close.assert_called_once()
+    curs.close.assert_not_called()
+
+
+def test_stream_query_never_closes_the_callers_mysql_connection():
+    cxn = create_autospec(MySQLConnection, instance=True)
+    curs = cxn.cursor.return_value
+    curs.fetchmany.side_effect = [[(1,), (2,)], [(3,)], []]
+
+    rows = stream_query(cxn, 'SELECT id FROM audit', batch_size=2)
+    assert next(rows) == (1,)
+    rows.close()
+    curs.close.assert_called_once()  # Drains the unread rows
+
+    curs.execute.side_effect = ProgrammingError
+    with raises(ProgrammingError):
+        next(stream_query(cxn, 'SELECT id FROM missing_table'))
+    cxn.close.assert_not_called()
+
+
+def test_stream_query_can_close_a_direct_connection_instead_of_draining():
+    cxn = create_autospec(MySQLConnection, instance=True)
+    curs = cxn.cursor.return_value
+    curs.fetchmany.side_effect = [[(1,), (2,)], [(3,)], []]
+
+    rows = stream_query(cxn, 'SELECT id FROM audit', batch_size=2, abandon='close')
+    assert next(rows) == (1,)
+    rows.close()
+    cxn.close.assert_called_once()
+    curs.close.assert_not_called()
+
+    with raises(SlimleafException):
+        next(stream_query(cxn, 'SELECT id FROM audit', abandon='kill'))
+
+
+def test_bulk_update_commits_per_chunk(sqlite_cxn):
+    rows = [[f'plan{i}'] for i in range(5)]
+
+    results = bulk_update_db(sqlite_cxn, 'INSERT INTO plans (name) VALUES (?)', rows, chunk_size=2)
+    assert results == [ChunkResult(2, 2), ChunkResult(2, 4), ChunkResult(1, 5)]
+    assert len(query_result(sqlite_cxn, 'SELECT id FROM plans')) == 5
+
+    with raises(SlimleafException) as bulk_exc:
+        bulk_update_db(sqlite_cxn, 'INSERT INTO plans (id, name) VALUES (?, ?)',
+                       [[10, 'x'], [11, 'y'], [12, 'z'], [12, 'dupe']], chunk_size=2)
+    assert 'rows 2-3' in str(bulk_exc.value)
+
+    with raises(SlimleafException):
+        bulk_update_db(sqlite_cxn, 'INSERT INTO plans (name) VALUES (?)', rows, chunk_size=0)
+    assert len(query_result(sqlite_cxn, 'SELECT id FROM plans')) == 7  # First chunk kept
+
+    with raises(SlimleafException):
+        bulk_update_db(sqlite_cxn, 'INSERT INTO plans (name) VALUES (?)', rows, multi_row=True)
+
+
+def test_bulk_update_rewrites_mysql_inserts():
+    cxn = create_autospec(MySQLConnection, instance=True)
+    curs = cxn.cursor.return_value
+    curs.mogrify.side_effect = lambda values, row: "('{}', {})".format(*row)
+    curs.rowcount, curs.lastrowid = 2, 41
+
+    results = bulk_update_db(
+        cxn, 'INSERT INTO plans (name, price) VALUES (%s, %s)', [('a', 1), ('b', 2)],
+        multi_row=True
+    )
+    curs.execute.assert_called_once_with("INSERT INTO plans (name, price) VALUES ('a', 1),('b', 2)")
+    assert results == [ChunkResult(row_count=2, last_row_id=41)]
+    cxn.commit.assert_called_once()
+
+
+def test_cached_query_results_are_invalidated_by_updates(sqlite_cxn):
+    QUERY_CACHE.invalidate()
+    update_db(sqlite_cxn, 'INSERT INTO plans (name) VALUES (?)', ['basic'])
+
+    hits, misses = QUERY_CACHE.hits, QUERY_CACHE.misses
+    first = query_result(sqlite_cxn, 'SELECT name FROM plans', cached=True)
+    assert query_result(sqlite_cxn, 'SELECT name FROM plans', cached=True) == first
+    assert (QUERY_CACHE.hits - hits, QUERY_CACHE.misses - misses) == (1, 1)
+
+    update_db(sqlite_cxn, 'INSERT INTO plans (name) VALUES (?)', ['pro'])
+    assert len(query_result(sqlite_cxn, 'SELECT name FROM plans', cached=True)) == 2
+
+
+def test_query_cache_expires_and_evicts():
+    cache = QueryCache(maxsize=2, ttl=60)
+    keys = [cache.key('cxn', 'SELECT ?', {'b': 2, 'a': [i]}) for i in range(3)]
+    assert cache.key('cxn', 'SELECT ?', {'a': [0], 'b': 2}) == keys[0]
+
+    for key in keys:
+        cache.set(key, 'result')
+    assert cache.get(keys[0]) == (False, None)  # Least recently used was evicted
+    assert cache.get(keys[2]) == (True, 'result')
+
+    cache.ttl = 0
+    cache.set(keys[2], 'result')
+    assert cache.get(keys[2]) == (False, None)
+    assert cache.stats == {'hits': 1, 'misses': 2, 'size': 1}
+
+
+def test_cached_results_never_leak_between_connections(tmp_path):
+    QUERY_CACHE.invalidate()
+    for name in ['basic', 'pro']:
+        cxn = get_sqlite3_conx(str(tmp_path / f'{name}.db'))
+        update_db(cxn, 'CREATE TABLE plans (id INTEGER PRIMARY KEY, name TEXT)')
+        update_db(cxn, 'INSERT INTO plans (name) VALUES (?)', [name])
+        cxn.close()
+
+    for _ in range(10):
+        for name in ['basic', 'pro']:
+            cxn = get_sqlite3_conx(str(tmp_path / f'{name}.db'))
+            result = query_result(cxn, 'SELECT name FROM plans', cached=True)
+            cxn.close()
+            del cxn  # Frees the id for the next connection
+            assert result == [(name,)]
+    QUERY_CACHE.invalidate()
+
+
+def test_cached_empty_results_still_raise_unless_allowed(sqlite_cxn):
+    QUERY_CACHE.invalidate()
+    assert query_result(sqlite_cxn, 'SELECT name FROM plans', empty_results=True, cached=True) == []
+    with raises(SlimleafException):
+        query_result(sqlite_cxn, 'SELECT name FROM plans', cached=True)
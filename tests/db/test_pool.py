@@ -0,0 +1,90 @@
+from threading import Thread
+from unittest.mock import MagicMock, patch
+
+from pytest import raises
+
+from slimleaf.db import ConnectionPool, close_mysql_pools, get_mysql_pool
+from slimleaf.exceptions import SlimleafException
+
+
+def test_pool_reuses_connections_up_to_max_size():
+    factory = MagicMock(side_effect=lambda: MagicMock())
+    pool = ConnectionPool(factory, max_size=2, timeout=0.05)
+
+    with pool.connection() as first:
+        pass
+    with pool.connection() as second:
+        assert second is first
+    assert factory.call_count == 1
+
+    held = [pool.acquire(), pool.acquire()]
+    assert pool.size == 2
+    with raises(SlimleafException):
+        pool.acquire()
+
+    # A waiting checkout is served as soon as a connection is released
+    Thread(target=pool.release, args=(held[0],)).start()
+    assert pool.acquire() is held[0]
+
+
+def test_pool_replaces_unhealthy_and_idle_connections():
+    factory = MagicMock(side_effect=lambda: MagicMock())
+    pool = ConnectionPool(factory, max_size=2)
+
+    with pool.connection() as broken:
+        broken.ping.side_effect = ConnectionError
+    with pool.connection() as replacement:
+        assert replacement is not broken
+    broken.close.assert_called_once()
+    assert pool.size == 1
+
+    pool.max_idle = 0
+    with pool.connection() as fresh:
+        assert fresh is not replacement
+    replacement.close.assert_called_once()
+
+
+def test_pool_rolls_back_on_error_and_closes():
+    pool = ConnectionPool(MagicMock(side_effect=lambda: MagicMock()))
+
+    with raises(ValueError):
+        with pool.connection() as cxn:
+            raise ValueError
+    cxn.rollback.assert_called_once()
+    assert pool.idle == 1
+
+    # Read-only use ends its transaction too, so the next checkout sees fresh data
+    with pool.connection() as same:
+        pass
+    assert same is cxn
+    assert cxn.rollback.call_count == 2
+
+    # A connection that cannot be rolled back is not returned to the pool
+    with pool.connection() as broken:
+        broken.rollback.side_effect = ConnectionError
+    broken.close.assert_called_once()
+    assert (pool.idle, pool.size) == (0, 0)
+    with pool.connection() as cxn:
+        pass
+
+    pool.close()
+    cxn.close.assert_called_once()
+    with raises(SlimleafException):
+        pool.acquire()
+
+
+@patch('slimleaf.db.db.connect')
+def test_mysql_pools_are_shared_per_connection_data(_mock_connect):
+    cxn_data = {'host': 'db', 'rw-user': 'user', 'rw-password': 'pw', 'database': 'qa'}
+
+    pool = get_mysql_pool(cxn_data)
+    assert get_mysql_pool(dict(reversed(list(cxn_data.items())))) is pool
+    assert get_mysql_pool({**cxn_data, 'database': 'other'}) is not pool
+
+    with pool.connection() as cxn:
+        assert cxn is _mock_connect.return_value
+    _mock_connect.assert_called_once_with(host='db', user='user', password='pw', db='qa')
+
+    close_mysql_pools()
+    assert get_mysql_pool(cxn_data) is not pool
+    close_mysql_pools()
@@ -0,0 +1,118 @@
+from threading import Thread
+import time
+from unittest.mock import MagicMock
+
+from pytest import raises
+from selenium.common.exceptions import JavascriptException
+
+from slimleaf.exceptions import SlimleafException
+from slimleaf.pages import DriverPool, WebPage
+
+
+class FakeDriver(object):
+    """In-process stand-in for a WebDriver session"""
+
+    def __init__(self):
+        self.window_handles = ['main']
+        self.current_window_handle = 'main'
+        self.cookies = {'session': 'abc'}
+        self.scripts = []
+        self.quit = MagicMock()
+        self.switch_to = MagicMock()
+        self.switch_to.window.side_effect = self._switch
+
+    def _switch(self, handle):
+        self.current_window_handle = handle
+
+    def close(self):
+        self.window_handles.remove(self.current_window_handle)
+
+    def delete_all_cookies(self):
+        self.cookies.clear()
+
+    def execute_script(self, script, *args):
+        self.scripts.append(script)
+
+
+def test_pool_prewarms_and_resets_between_leases():
+    factory = MagicMock(side_effect=FakeDriver)
+    pool = DriverPool(factory, size=2)
+    assert factory.call_count == 2
+    assert pool.idle == 2
+
+    with pool.lease() as driver:
+        driver.window_handles += ['popup', 'other']
+        driver.current_window_handle = 'other'
+    assert driver.window_handles == ['main']
+    assert driver.current_window_handle == 'main'
+    assert driver.cookies == {}
+    assert 'localStorage.clear' in driver.scripts[-1]
+
+    with pool.lease(WebPage, 'http://example.test') as page:
+        assert isinstance(page, WebPage)
+        assert page.driver in pool._leases
+    assert factory.call_count == 2
+
+    pool.close()
+    assert driver.quit.call_count == 1
+    with raises(SlimleafException):
+        pool.acquire()
+
+
+def test_pool_recycles_worn_out_and_unhealthy_drivers():
+    factory = MagicMock(side_effect=FakeDriver)
+    pool = DriverPool(factory, size=1, max_leases=2, health_check=lambda d: not d.cookies)
+
+    first = pool.acquire()  # Cookies left over from startup fail the health check
+    assert factory.call_count == 2
+    pool.release(first)
+    assert pool.acquire() is first
+    pool.release(first)  # Second lease reached max_leases
+
+    replacement = pool.acquire()
+    assert replacement is not first
+    first.quit.assert_called_once()
+    assert pool.size == 1
+
+
+def test_pool_waits_for_release_and_times_out():
+    pool = DriverPool(FakeDriver, size=1, timeout=0.05)
+    held = pool.acquire()
+    with raises(SlimleafException):
+        pool.acquire()
+
+    pool.timeout = 5
+    Thread(target=pool.release, args=(held,)).start()
+    assert pool.acquire() is held
+
+
+def test_failed_replacements_do_not_mask_errors_or_stall_the_pool():
+    factory = MagicMock(side_effect=[FakeDriver()])
+    pool = DriverPool(factory, size=1, max_leases=1)
+
+    factory.side_effect = RuntimeError('grid down')
+    with raises(AssertionError):
+        with pool.lease():
+            assert False, 'the test failed'
+    assert pool.size == 0
+
+    started = time.monotonic()
+    with raises(SlimleafException) as start_exc:
+        pool.acquire()
+    assert 'grid down' in str(start_exc.value)
+    assert time.monotonic() - started < 1  # Fails fast instead of waiting out the timeout
+
+    factory.side_effect = FakeDriver
+    with pool.lease() as driver:
+        assert isinstance(driver, FakeDriver)
+    assert pool.size == 1
+
+
+def test_reset_tolerates_pages_without_storage():
+    factory = MagicMock(side_effect=FakeDriver)
+    pool = DriverPool(factory, size=1)
+
+    with pool.lease() as driver:
+        driver.execute_script = MagicMock(side_effect=JavascriptException('SecurityError'))
+    assert pool.acquire() is driver
+    assert factory.call_count == 1
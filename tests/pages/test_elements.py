@@ -10,19 +10,21 @@ from slimleaf.webdriver.locator import Locator
 TEST_LOCTR = Locator(by=By.CSS_SELECTOR, value="unimportant")
 
 
-@patch('slimleaf.pages.web.elements.WebDriverWait')
+@patch('slimleaf.pages.web.elements.SmartWait')
 def test_elements(_mock_wait, mock_driver):
     base_element = elems.Element(driver=mock_driver, locator=TEST_LOCTR, timeout=5)
 
+    _mock_wait.assert_not_called()  # Elements are located lazily
+
+    base_element.text
     _mock_wait.assert_called_once()
 
     base_element.click()
-    base_element.text
     base_element.is_displayed
     base_element.scroll_into_view(offset=200)
 
 
-@patch('slimleaf.pages.web.elements.WebDriverWait')
+@patch('slimleaf.pages.web.elements.SmartWait')
 def test_input_element(_mock_wait, mock_text, mock_driver):
     mock_elem = MagicMock()
     mock_elem.get_attribute.return_value = mock_text
@@ -35,7 +37,7 @@ def test_input_element(_mock_wait, mock_text, mock_driver):
     input_element.web_element.clear.assert_called_once()
 
 
-@patch('slimleaf.pages.web.elements.WebDriverWait')
+@patch('slimleaf.pages.web.elements.SmartWait')
 def test_checkbox_element(_mock_wait, mock_driver):
     mock_elem = MagicMock()
     _mock_wait.return_value = mock_elem
@@ -45,7 +47,7 @@ def test_checkbox_element(_mock_wait, mock_driver):
     checkbox_element.web_element.get_attribute.assert_called_once()
 
 
-@patch('slimleaf.pages.web.elements.WebDriverWait')
+@patch('slimleaf.pages.web.elements.SmartWait')
 def test_radio_input_element(_mock_wait, mock_driver):
     mock_elem = MagicMock()
     _mock_wait.return_value = mock_elem
@@ -55,19 +57,21 @@ def test_radio_input_element(_mock_wait, mock_driver):
     radio_element.web_element.is_selected.assert_called_once()
 
 
-@patch('slimleaf.pages.web.elements.WebDriverWait')
+@patch('slimleaf.pages.web.elements.SmartWait')
 def test_radio_field_element(_mock_wait, mock_driver):
-    mock_elem = MagicMock()
-    mock_elem.selected = True
-    _mock_wait.return_value = mock_elem
+    mock_elem = elems.RadioInputElement(mock_driver, TEST_LOCTR)
+    mock_driver.execute_script.return_value = [
+        {'text': '', 'value': 'on', 'selected': True, 'displayed': True, 'attributes': {}}
+    ]
 
     radio_field_elem = elems.RadioField()
     radio_field_elem.add_input(mock_elem)
     assert radio_field_elem.selected == mock_elem
+    mock_driver.execute_script.assert_called_once()
 
 
 @patch('slimleaf.pages.web.elements.Select')
-@patch('slimleaf.pages.web.elements.WebDriverWait')
+@patch('slimleaf.pages.web.elements.SmartWait')
 def test_select_element(_mock_wait, _mock_select, mock_text, mock_driver):
     mock_elem = MagicMock()
     _mock_wait.return_value = mock_elem
@@ -85,10 +89,16 @@ def test_select_element(_mock_wait, _mock_select, mock_text, mock_driver):
 
     select_element.choose('unimportant')
     select_element.select_elem.select_by_visible_text.assert_called_once()
+
+    # Option text is read in bulk by a single script
+    mock_driver.execute_script.return_value = [
+        {'text': mock_text, 'value': '', 'selected': True, 'displayed': True, 'attributes': {}}
+    ]
     assert select_element.options == [mock_text]
+    mock_driver.execute_script.assert_called_once()
 
 
-@patch('slimleaf.pages.web.elements.WebDriverWait')
+@patch('slimleaf.pages.web.elements.SmartWait')
 def test_unchanged_element_classes(_mock_wait, mock_driver):
     mock_elem = MagicMock()
     _mock_wait.return_value = mock_elem
@@ -103,7 +113,7 @@ def test_unchanged_element_classes(_mock_wait, mock_driver):
         assert False
 
 
-@patch('slimleaf.pages.web.elements.WebDriverWait')
+@patch('slimleaf.pages.web.elements.SmartWait')
 def test_modal_element(_mock_wait, mock_driver):
 
     mock_elem = MagicMock()
@@ -1,9 +1,14 @@
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
+
+from selenium.common.exceptions import (
+    NoSuchElementException, TimeoutException, WebDriverException
+)
 
 from pytest import raises
 from selenium.webdriver.common.by import By
 
-from slimleaf.pages import Page
+from slimleaf.pages import ElementField, Page, detect_current_page
+from slimleaf.pages.web.elements import Element, ElementList
 from slimleaf.exceptions import SlimleafException
 from slimleaf.webdriver.locator import Locator
 
@@ -40,6 +45,7 @@ def test_can_access_page_html_tree(mock_driver):
     fake_elem.etree_locator = Locator(by=By.CSS_SELECTOR, value='p')
     fake_source_2 = f"<html><body><p>{fake_paragraph_txt}</p><p>unimportant</p></body></html>"
     mock_driver.page_source = fake_source_2
+    page.invalidate_snapshot()
     with raises(SlimleafException) as too_many_results_exc:
         page.get_element_tree(fake_elem)
     assert 'Expected one' in str(too_many_results_exc.value)
@@ -52,5 +58,207 @@ def test_can_access_page_html_tree(mock_driver):
 
     # Successful Tree generation
     mock_driver.page_source = fake_source_1  # Only one <p> tag
+    page.invalidate_snapshot()
     fake_elem.etree_locator = Locator(by=By.CSS_SELECTOR, value='p')
     assert page.get_element_tree(fake_elem).text == fake_paragraph_txt
+
+
+def test_html_tree_snapshot_is_reused_until_invalidated(mock_driver):
+    mock_driver.page_source = "<html><body><p>first</p></body></html>"
+    page = MockPage(mock_driver)
+
+    first_tree = page.html_tree
+    assert page.html_tree is first_tree
+    assert page.snapshot_stats == {'hits': 1, 'misses': 1}
+
+    # Pages sharing a driver share its snapshot
+    assert MockPage(mock_driver).html_tree is first_tree
+
+    mock_driver.page_source = "<html><body><p>second</p></body></html>"
+    page.invalidate_snapshot()
+    assert page.html_tree.xpath('//p')[0].text == 'second'
+    assert page.snapshot_stats == {'hits': 2, 'misses': 2}
+
+
+def test_get_element_trees_uses_one_snapshot(mock_driver):
+    mock_driver.page_source = (
+        "<html><body><p id='first'>one</p><p id='second'>two</p><span>x</span><span>y</span>"
+        "</body></html>"
+    )
+    page = MockPage(mock_driver)
+
+    fake_elem = MagicMock()
+    fake_elem.etree_locator = Locator(by=By.CSS_SELECTOR, value='#first')
+    second_loctr = Locator(by=By.XPATH, value="//p[@id='second']")
+
+    trees = page.get_element_trees([fake_elem, second_loctr])
+    assert trees[fake_elem].text == 'one'
+    assert trees[second_loctr].text == 'two'
+    assert page.snapshot_stats['misses'] == 1
+
+    with raises(SlimleafException) as too_many_results_exc:
+        page.get_element_trees([fake_elem, Locator(by=By.CSS_SELECTOR, value='span')])
+    assert 'Expected one' in str(too_many_results_exc.value)
+
+    with raises(SlimleafException) as no_results_exc:
+        page.get_element_trees([Locator(by=By.CSS_SELECTOR, value='a')])
+    assert 'No matching tree object' in str(no_results_exc.value)
+
+
+class OtherMockPage(Page):
+
+    @property
+    def unique_locator(self):
+        return Locator(By.ID, 'other')
+
+
+def test_is_current_page_timeout_is_configurable(mock_driver):
+    mock_driver.find_element.side_effect = NoSuchElementException
+
+    page = MockPage(mock_driver, page_timeout=0)
+    assert page.page_timeout == 0
+    assert not page.is_current_page
+    mock_driver.find_element.assert_called_once()
+
+    assert MockPage(mock_driver).page_timeout == 30
+
+
+def test_detect_current_page_races_candidates_in_one_script(mock_driver):
+    mock_page = MockPage(mock_driver)
+    other_page = OtherMockPage(mock_driver)
+
+    mock_driver.execute_script.return_value = 1
+    assert detect_current_page([mock_page, other_page]) is other_page
+    mock_driver.execute_script.assert_called_once()
+    xpaths = mock_driver.execute_script.call_args[0][1]
+    assert xpaths == ["descendant-or-self::unimportant", "descendant-or-self::*[@id = 'other']"]
+
+    mock_driver.execute_script.return_value = -1
+    assert detect_current_page([mock_page, other_page], timeout=0) is None
+
+
+def test_detect_current_page_falls_back_without_scripts(mock_driver):
+    mock_page = MockPage(mock_driver)
+    other_page = OtherMockPage(mock_driver)
+
+    mock_driver.execute_script.side_effect = WebDriverException
+    mock_driver.find_elements.side_effect = lambda by, value: ['found'] if value == 'other' else []
+    assert detect_current_page([mock_page, other_page], timeout=0) is other_page
+
+
+def test_dom_changes_between_snapshots(mock_driver):
+    page = MockPage(mock_driver)
+    mock_driver.page_source = "<html><body><p>before</p><p>same</p></body></html>"
+    assert page.dom_changes() == {}
+    page.html_tree
+
+    page.invalidate_snapshot()
+    mock_driver.page_source = "<html><body><p>after</p><p>same</p></body></html>"
+    changes = page.dom_changes()
+    assert [tree.text for tree in changes.values()] == ['after']
+    assert list(changes) == [Locator(By.XPATH, '/html/body/p[1]')]
+
+
+def test_wait_for_dom_change_polls_region_hash(mock_driver):
+    page = MockPage(mock_driver)
+    mock_driver.page_source = "<html><body><div id='widget'></div></body></html>"
+    page.html_tree
+    mock_driver.execute_script.side_effect = ['0:10', '0:10', '7:12']
+
+    assert page.wait_for_dom_change(Locator(By.ID, 'widget')) == '7:12'
+    assert mock_driver.execute_script.call_count == 3
+    assert mock_driver.execute_script.call_args[0][1] == "descendant-or-self::*[@id = 'widget']"
+    assert page.snapshot_stats['misses'] == 1
+    page.html_tree
+    assert page.snapshot_stats['misses'] == 2
+
+    mock_driver.execute_script.side_effect = None
+    mock_driver.execute_script.return_value = '7:12'
+    with raises(TimeoutException):
+        page.wait_for_dom_change(Locator(By.ID, 'widget'), timeout=0, baseline='7:12')
+    with raises(SlimleafException):
+        page.region_hash(Locator(By.LINK_TEXT, 'widget'))
+
+
+class FieldsPage(MockPage):
+
+    heading = ElementField(Element, Locator(By.CSS_SELECTOR, 'h1'), timeout=5)
+    rows = ElementField(ElementList, Locator(By.CLASS_NAME, 'row'))
+    by_link = ElementField(Element, Locator(By.LINK_TEXT, 'Help'))
+
+
+class OverridingPage(FieldsPage):
+
+    by_link = None
+    submit = ElementField(Element, Locator(By.ID, 'submit'))
+
+
+def test_element_fields_are_registered_and_cached(mock_driver):
+    assert list(FieldsPage._element_fields) == ['heading', 'rows', 'by_link']
+    assert list(OverridingPage._element_fields) == ['heading', 'rows', 'submit']
+    assert isinstance(FieldsPage.heading, ElementField)
+
+    page = FieldsPage(mock_driver)
+    assert page.heading is page.heading
+    assert page.heading.timeout == 5
+    assert isinstance(page.rows, ElementList)
+    assert FieldsPage(mock_driver).heading is not page.heading
+
+    heading = page.heading
+    page.invalidate_snapshot()  # e.g. on navigation
+    assert page.heading is not heading
+
+
+def test_prefetch_fields_in_one_script(mock_driver):
+    page = FieldsPage(mock_driver)
+    mock_driver.execute_script.return_value = [
+        [_match('h1', 'Dashboard')], [_match('row 1', 'one'), _match('row 2', 'two')]
+    ]
+
+    with patch('slimleaf.pages.page.xpath_for') as xpath_for:
+        elements = page.prefetch_fields()
+    xpath_for.assert_not_called()  # The fields' precomputed XPaths are used
+    assert list(elements) == ['heading', 'rows']
+    mock_driver.execute_script.assert_called_once()
+    assert mock_driver.execute_script.call_args[0][1] == [
+        field.xpath for field in FieldsPage._element_fields.values() if field.xpath
+    ]
+    assert mock_driver.execute_script.call_args[0][2] == [False, True]
+
+    assert page.heading.web_element == 'h1'
+    assert len(page.rows) == 2
+    mock_driver.find_element.assert_not_called()
+    mock_driver.find_elements.assert_not_called()
+
+
+def _match(web_element, text, displayed=True, attributes=None):
+    properties = {
+        'text': text, 'value': None, 'selected': False, 'displayed': displayed,
+        'attributes': attributes or {},
+    }
+    return {'element': web_element, 'properties': properties}
+
+
+def test_prefetch_returns_handles_and_properties(mock_driver):
+    page = MockPage(mock_driver)
+    username = Element(mock_driver, Locator(By.NAME, 'username'))
+    missing = Element(mock_driver, Locator(By.ID, 'missing'))
+    by_link = Element(mock_driver, Locator(By.LINK_TEXT, 'Help'))
+    mock_driver.execute_script.return_value = [
+        [_match('input', '', attributes={'id': 'user', 'type': 'text'})], []
+    ]
+
+    located = page.prefetch([username, missing, by_link], attributes=['id', 'type'])
+    mock_driver.execute_script.assert_called_once()
+    _, xpaths, many, attributes = mock_driver.execute_script.call_args[0]
+    assert xpaths == ["descendant-or-self::*[@name = 'username']",
+                      "descendant-or-self::*[@id = 'missing']"]
+    assert (many, attributes) == ([False, False], ['id', 'type'])
+
+    assert located[username].web_element == 'input'
+    assert located[username].properties.displayed
+    assert located[username].properties.attributes['type'] == 'text'
+    assert located[missing] is None
+    assert by_link not in located
+    assert username.web_element == 'input'
+    assert page.prefetch([]) == {}
@@ -0,0 +1,56 @@
+from pytest import raises
+from selenium.webdriver.common.by import By
+
+from slimleaf.exceptions import SlimleafException
+from slimleaf.pages import SnapshotPage, WebPage
+from slimleaf.pages.web.elements import Element, ElementList
+from slimleaf.webdriver.locator import Locator
+
+ROW = '<tr class="row" data-state="{state}"><td>Order  {num}</td></tr>'
+SOURCE = (
+    '<html><body><h1 id="dashboard">Dashboard</h1><table>'
+    + ''.join(ROW.format(num=num, state='open' if num % 2 else 'closed') for num in range(2000))
+    + '</table></body></html>'
+)
+
+
+class DashboardPage(WebPage):
+
+    @property
+    def unique_locator(self):
+        return Locator(By.ID, 'dashboard')
+
+
+class OfflineDashboardPage(SnapshotPage, DashboardPage):
+    pass
+
+
+def test_snapshot_page_from_file_needs_no_driver(tmp_path, monkeypatch):
+    monkeypatch.setattr('slimleaf.pages.snapshot_page.PARSE_CHUNK_SIZE', 4096)
+    capture = tmp_path / 'dashboard.html'
+    capture.write_text(SOURCE)
+
+    page = OfflineDashboardPage(capture)
+    assert page.driver is None
+    assert page.is_current_page
+    assert not SnapshotPage(capture, unique_locator=Locator(By.ID, 'login')).is_current_page
+
+    heading = Element(None, etree_locator=Locator(By.CSS_SELECTOR, 'h1'))
+    assert page.get_element_tree(heading).text == 'Dashboard'
+
+    rows = ElementList(None, etree_locator=Locator(By.CSS_SELECTOR, 'tr.row'))
+    assert len(page.find_all(rows)) == 2000
+    assert len(page.find_all(rows, attributes={'data-state': 'open'})) == 1000
+    [match] = page.find_all(Locator(By.CLASS_NAME, 'row'), text='Order 1999')
+    assert match.get('data-state') == 'open'
+
+
+def test_snapshot_page_from_bytes():
+    page = SnapshotPage(SOURCE.encode(), unique_locator=Locator(By.TAG_NAME, 'table'))
+    assert page.is_current_page
+    assert page.find_all(Locator(By.XPATH, '//h1'))[0].text == 'Dashboard'
+
+    with raises(SlimleafException):
+        page.find_all(Locator(By.LINK_TEXT, 'Dashboard'))
+    with raises(SlimleafException):
+        SnapshotPage(b'').html_tree
@@ -1,28 +1,34 @@
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, PropertyMock
 
+from selenium.common.exceptions import StaleElementReferenceException
 from selenium.webdriver.common.by import By
 from pytest import raises
 
 from slimleaf.pages.web import elements as elems
 from slimleaf.webdriver.locator import Locator
+from slimleaf.webdriver.selectors import xpath_for
+from slimleaf.webdriver.snapshot import invalidate_snapshot, snapshot_cache
+from slimleaf.webdriver.wait import WAIT_STATS
 
 
 TEST_LOCTR = Locator(by=By.CSS_SELECTOR, value="unimportant")
 
 
-@patch('slimleaf.pages.web.elements.WebDriverWait')
+@patch('slimleaf.pages.web.elements.SmartWait')
 def test_elements(_mock_wait, mock_driver):
     base_element = elems.Element(driver=mock_driver, locator=TEST_LOCTR, timeout=5)
 
+    _mock_wait.assert_not_called()  # Elements are located lazily
+
+    base_element.text
     _mock_wait.assert_called_once()
 
     base_element.click()
-    base_element.text
     base_element.is_displayed
     base_element.scroll_into_view(offset=200)
 
 
-@patch('slimleaf.pages.web.elements.WebDriverWait')
+@patch('slimleaf.pages.web.elements.SmartWait')
 def test_input_element(_mock_wait, mock_text, mock_driver):
     mock_elem = MagicMock()
     mock_elem.get_attribute.return_value = mock_text
@@ -35,7 +41,7 @@ def test_input_element(_mock_wait, mock_text, mock_driver):
     input_element.web_element.clear.assert_called_once()
 
 
-@patch('slimleaf.pages.web.elements.WebDriverWait')
+@patch('slimleaf.pages.web.elements.SmartWait')
 def test_checkbox_element(_mock_wait, mock_driver):
     mock_elem = MagicMock()
     _mock_wait.return_value = mock_elem
@@ -45,7 +51,7 @@ def test_checkbox_element(_mock_wait, mock_driver):
     checkbox_element.web_element.get_attribute.assert_called_once()
 
 
-@patch('slimleaf.pages.web.elements.WebDriverWait')
+@patch('slimleaf.pages.web.elements.SmartWait')
 def test_radio_input_element(_mock_wait, mock_driver):
     mock_elem = MagicMock()
     _mock_wait.return_value = mock_elem
@@ -55,19 +61,22 @@ def test_radio_input_element(_mock_wait, mock_driver):
     radio_element.web_element.is_selected.assert_called_once()
 
 
-@patch('slimleaf.pages.web.elements.WebDriverWait')
+@patch('slimleaf.pages.web.elements.SmartWait')
 def test_radio_field_element(_mock_wait, mock_driver):
-    mock_elem = MagicMock()
-    mock_elem.selected = True
-    _mock_wait.return_value = mock_elem
+    mock_elem = elems.RadioInputElement(mock_driver, TEST_LOCTR)
+    mock_driver.execute_script.return_value = [
+        {'text': '', 'value': 'on', 'selected': True, 'displayed': True, 'attributes': {}}
+    ]
 
-    radio_field_elem = elems.RadioField()
+    radio_field_elem = elems.RadioField()  # Reads through the driver of its inputs
+    assert radio_field_elem.selected_inputs == []
     radio_field_elem.add_input(mock_elem)
     assert radio_field_elem.selected == mock_elem
+    mock_driver.execute_script.assert_called_once()
 
 
 @patch('slimleaf.pages.web.elements.Select')
-@patch('slimleaf.pages.web.elements.WebDriverWait')
+@patch('slimleaf.pages.web.elements.SmartWait')
 def test_select_element(_mock_wait, _mock_select, mock_text, mock_driver):
     mock_elem = MagicMock()
     _mock_wait.return_value = mock_elem
@@ -85,10 +94,16 @@ def test_select_element(_mock_wait, _mock_select, mock_text, mock_driver):
 
     select_element.choose('unimportant')
     select_element.select_elem.select_by_visible_text.assert_called_once()
+
+    # Option text is read in bulk by a single script
+    mock_driver.execute_script.return_value = [
+        {'text': mock_text, 'value': '', 'selected': True, 'displayed': True, 'attributes': {}}
+    ]
     assert select_element.options == [mock_text]
+    mock_driver.execute_script.assert_called_once()
 
 
-@patch('slimleaf.pages.web.elements.WebDriverWait')
+@patch('slimleaf.pages.web.elements.SmartWait')
 def test_unchanged_element_classes(_mock_wait, mock_driver):
     mock_elem = MagicMock()
     _mock_wait.return_value = mock_elem
@@ -103,7 +118,7 @@ def test_unchanged_element_classes(_mock_wait, mock_driver):
         assert False
 
 
-@patch('slimleaf.pages.web.elements.WebDriverWait')
+@patch('slimleaf.pages.web.elements.SmartWait')
 def test_modal_element(_mock_wait, mock_driver):
 
     mock_elem = MagicMock()
@@ -113,3 +128,189 @@ def test_modal_element(_mock_wait, mock_driver):
         modal_elem.is_displayed()
     with raises(NotImplementedError):
         modal_elem.close_button()
+
+
+@patch('slimleaf.pages.web.elements.SmartWait')
+def test_interactions_invalidate_snapshot(_mock_wait, mock_driver):
+    mock_driver.page_source = "<html><body></body></html>"
+    cache = snapshot_cache(mock_driver)
+    cache.get_tree(mock_driver)
+
+    elems.Element(mock_driver, TEST_LOCTR).click()
+    assert cache.tree is None
+
+    cache.get_tree(mock_driver)
+    elems.InputElement(mock_driver, TEST_LOCTR).text = 'unimportant'
+    assert cache.tree is None
+
+
+@patch('slimleaf.pages.web.elements.SmartWait')
+def test_element_relocates_stale_web_element(_mock_wait, mock_driver):
+    stale_elem = MagicMock()
+    type(stale_elem).text = PropertyMock(side_effect=StaleElementReferenceException)
+    fresh_elem = MagicMock()
+    fresh_elem.text = 'fresh'
+    _mock_wait.return_value.until.side_effect = [stale_elem, fresh_elem]
+
+    element = elems.Element(mock_driver, TEST_LOCTR)
+    assert element.text == 'fresh'
+    assert element.web_element is fresh_elem
+
+    # A pre-located handle is used without another lookup
+    handle = MagicMock()
+    assert elems.Element(mock_driver, TEST_LOCTR, web_element=handle).web_element is handle
+    assert _mock_wait.return_value.until.call_count == 2
+
+
+def test_click_reuses_located_element(mock_driver):
+    WAIT_STATS.reset()
+    handle = MagicMock()
+    element = elems.Element(mock_driver, TEST_LOCTR, timeout=1, web_element=handle)
+
+    element.click()
+    handle.click.assert_called_once()
+    mock_driver.find_element.assert_not_called()
+    click_stats = WAIT_STATS.snapshot()['element.click']
+    assert (click_stats['waits'], click_stats['polls']) == (1, 1)
+    assert 'element.find' not in WAIT_STATS.snapshot()
+
+    # Stale handles fall back to locating the element again
+    handle.is_displayed.side_effect = StaleElementReferenceException
+    mock_driver.find_element.return_value.is_displayed.return_value = True
+    element.click()
+    mock_driver.find_element.assert_called_once_with(*TEST_LOCTR)
+    assert element.web_element is mock_driver.find_element.return_value
+    relocate_stats = WAIT_STATS.snapshot()['element.click.relocate']
+    assert (relocate_stats['waits'], relocate_stats['polls']) == (1, 1)
+
+
+def _properties(text='', value='', selected=False, displayed=True, attributes=None):
+    return {
+        'text': text, 'value': value, 'selected': selected, 'displayed': displayed,
+        'attributes': attributes or {},
+    }
+
+
+def test_radio_field_reads_inputs_in_one_script(mock_driver):
+    radio_field = elems.RadioField(driver=mock_driver)
+    inputs = [
+        elems.RadioInputElement(mock_driver, TEST_LOCTR, web_element=MagicMock()) for _ in range(3)
+    ]
+    for input_elem in inputs:
+        radio_field.add_input(input_elem)
+
+    mock_driver.execute_script.return_value = [
+        _properties(), _properties(selected=True), _properties()
+    ]
+    assert radio_field.selected is inputs[1]
+    mock_driver.execute_script.assert_called_once()
+    for input_elem in inputs:
+        input_elem.web_element.is_selected.assert_not_called()
+
+
+def test_element_list_reads_items_in_bulk(mock_driver):
+    handles = [MagicMock(), MagicMock()]
+    mock_driver.find_elements.return_value = handles
+    mock_driver.execute_script.return_value = [
+        _properties(text='first', attributes={'href': '/1'}),
+        _properties(text='second', attributes={'href': '/2'}),
+    ]
+
+    element_list = elems.ElementList(mock_driver, TEST_LOCTR)
+    assert element_list.texts == ['first', 'second']
+    assert [item.attributes['href'] for item in element_list.read(['href'])] == ['/1', '/2']
+
+    mock_driver.find_elements.assert_called_once_with(*TEST_LOCTR)
+    script_args = mock_driver.execute_script.call_args[0]
+    assert script_args[1:] == (handles, ['href'], False)
+
+
+def test_element_list_wraps_items_lazily(mock_driver):
+    handles = [MagicMock() for _ in range(5)]
+    mock_driver.find_elements.return_value = handles
+    mock_driver.page_source = (
+        "<html><body><ul>"
+        "<li class='row' data-id='1'>Alpha</li><li class='row' data-id='2'>Beta</li>"
+        "<li class='row' data-id='3'> Alpha </li><li class='row' data-id='4'>Gamma</li>"
+        "<li class='row' data-id='5'>Delta</li>"
+        "</ul></body></html>"
+    )
+
+    rows = elems.ElementList(mock_driver, Locator(By.CSS_SELECTOR, 'li.row'), elems.LabelElement)
+    assert len(rows) == 5
+    assert rows._items == {}  # Counting does not build wrappers
+
+    last = rows[-1]
+    assert isinstance(last, elems.LabelElement)
+    assert last.web_element is handles[4]
+    assert last.locator.by == By.XPATH and last.locator.value.endswith('[5]')
+    assert rows[4] is last
+
+    assert [row.web_element for row in rows[1:3]] == handles[1:3]
+
+    # Filtering is served by the page snapshot, not a remote call per row
+    assert [row.web_element for row in rows.filter(text='Alpha')] == [handles[0], handles[2]]
+    assert rows.filter(attributes={'data-id': '4'})[0].web_element is handles[3]
+    mock_driver.execute_script.assert_not_called()
+    mock_driver.find_elements.assert_called_once()
+
+    with raises(IndexError):
+        rows[5]
+
+
+def test_element_list_filter_falls_back_to_bulk_read(mock_driver):
+    mock_driver.find_elements.return_value = [MagicMock(), MagicMock()]
+    mock_driver.page_source = "<html><body><li class='row'>stale snapshot</li></body></html>"
+    mock_driver.execute_script.return_value = [
+        _properties(text='Alpha', attributes={'data-id': '1'}),
+        _properties(text='Beta', attributes={'data-id': '2'}),
+    ]
+
+    rows = elems.ElementList(mock_driver, Locator(By.CSS_SELECTOR, 'li.row'))
+    assert [row.web_element for row in rows.filter(text='Beta', attributes={'data-id': '2'})] == [
+        mock_driver.find_elements.return_value[1]
+    ]
+    mock_driver.execute_script.assert_called_once()
+    assert mock_driver.execute_script.call_args.args[-1] is True  # textContent, as in the snapshot
+
+
+def test_element_list_filter_ignores_snapshot_older_than_items(mock_driver):
+    handles = [MagicMock(), MagicMock()]
+    mock_driver.find_elements.return_value = handles
+    mock_driver.page_source = (
+        "<html><body><li class='row'>Alpha</li><li class='row'>Beta</li></body></html>"
+    )
+    snapshot_cache(mock_driver).get_tree(mock_driver)  # Taken before the rows re-render
+
+    mock_driver.execute_script.return_value = [
+        _properties(text='Gamma'), _properties(text='Alpha'),
+    ]
+    rows = elems.ElementList(mock_driver, Locator(By.CSS_SELECTOR, 'li.row'))
+    assert [row.web_element for row in rows.filter(text='Alpha')] == [handles[1]]
+    mock_driver.execute_script.assert_called_once()
+
+    # A snapshot taken once the rows are located is trusted
+    invalidate_snapshot(mock_driver)
+    mock_driver.page_source = (
+        "<html><body><li class='row'>Gamma</li><li class='row'>Alpha</li></body></html>"
+    )
+    assert [row.web_element for row in rows.filter(text='Gamma')] == [handles[0]]
+    mock_driver.execute_script.assert_called_once()
+
+
+def test_element_list_accepts_css_that_cannot_be_translated(mock_driver):
+    mock_driver.find_elements.return_value = [MagicMock(), MagicMock()]
+    mock_driver.execute_script.return_value = [
+        _properties(text='Alpha', attributes={}), _properties(text='Beta', attributes={}),
+    ]
+
+    for css in ['a::before', 'li:nth-child(2 of .x)']:
+        rows = elems.ElementList(mock_driver, Locator(By.CSS_SELECTOR, css))
+        assert rows.etree_locator is None
+        assert rows[1].locator is None
+        assert [row.web_element for row in rows.filter(text='Beta')] == [
+            mock_driver.find_elements.return_value[1]
+        ]
+
+    rows = elems.ElementList(mock_driver, Locator(By.CSS_SELECTOR, 'li.row'))
+    assert rows.etree_locator == Locator(By.XPATH, xpath_for(rows.locator))
@@ -4,7 +4,8 @@ from pytest import raises
 from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.by import By
 
-from slimleaf.pages import WebPage
+from slimleaf.pages import ElementField, WebPage
+from slimleaf.pages.web.elements import Element
 from slimleaf.pages.web.web_page import PageMismatchException
 from slimleaf.webdriver.locator import Locator
 
@@ -21,8 +22,8 @@ class MockPage(WebPage):
         return Locator(By.CSS_SELECTOR, 'unimportant')
 
 
-@patch('slimleaf.pages.web.web_page.WebDriverWait')
-@patch('slimleaf.pages.page.WebDriverWait')
+@patch('slimleaf.pages.web.web_page.SmartWait')
+@patch('slimleaf.pages.page.SmartWait')
 def test_can_use_base_inherited_class(_mock_wait_page, _mock_wait_web, mock_text, mock_driver):
 
     # Successful arrival
@@ -65,3 +66,21 @@ def test_can_use_base_inherited_class(_mock_wait_page, _mock_wait_web, mock_text
     mock_driver.reset_mock()
     test_page.scroll_to_top()
     mock_driver.execute_script.assert_called_once()
+
+
+class FieldsPage(MockPage):
+
+    heading = ElementField(Element, Locator(By.CSS_SELECTOR, 'h1'))
+
+
+def test_window_changes_drop_cached_elements(mock_driver):
+    mock_driver.window_handles = ['main', 'popup']
+    page = FieldsPage(TEST_URL, mock_driver)
+
+    heading = page.heading
+    page.close()
+    assert page.heading is not heading
+
+    heading = page.heading
+    page.switch_to_window('main')
+    assert page.heading is not heading
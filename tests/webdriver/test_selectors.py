@@ -0,0 +1,35 @@
+from lxml import etree
+from pytest import raises
+from selenium.webdriver.common.by import By
+
+from slimleaf.exceptions import SlimleafException
+from slimleaf.pages.web import elements as elems
+from slimleaf.webdriver.locator import Locator
+from slimleaf.webdriver.selectors import compiled_selector
+
+TEST_HTML = "<html><body><p class='intro'>hello</p><p>world</p></body></html>"
+
+
+def test_compiled_selectors_are_cached():
+    tree = etree.fromstring(TEST_HTML, parser=etree.HTMLParser())
+    css_loctr = Locator(By.CSS_SELECTOR, 'p.intro')
+    xpath_loctr = Locator(By.XPATH, '//p')
+
+    assert compiled_selector(css_loctr) is compiled_selector(css_loctr)
+    assert [p.text for p in compiled_selector(css_loctr)(tree)] == ['hello']
+    assert len(compiled_selector(xpath_loctr)(tree)) == 2
+
+    with raises(SlimleafException):
+        compiled_selector(Locator(By.ID, 'unimportant'))
+
+
+def test_static_etree_locators_compile_at_class_definition():
+    loctr = Locator(By.CSS_SELECTOR, 'p.precompiled')
+    misses = compiled_selector.cache_info().misses
+
+    class PrecompiledElement(elems.Element):
+        _etree_locator = loctr
+
+    assert compiled_selector.cache_info().misses == misses + 1
+    compiled_selector(loctr)
+    assert compiled_selector.cache_info().misses == misses + 1
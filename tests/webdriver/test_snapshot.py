@@ -0,0 +1,32 @@
+from lxml import etree
+from selenium.webdriver.common.by import By
+
+from slimleaf.webdriver.locator import Locator
+from slimleaf.webdriver.snapshot import diff_trees
+
+SOURCE = """<html><body>
+<div id="nav"><a href="/">Home</a></div>
+<div id="widget"><span class="count">{count}</span><ul>{items}</ul></div>
+<div id="footer" class="{footer}">Footer</div>
+</body></html>"""
+
+
+def _tree(count=1, items=('a',), footer='plain'):
+    items = ''.join(f'<li>{item}</li>' for item in items)
+    html = SOURCE.format(count=count, items=items, footer=footer)
+    return etree.fromstring(html, parser=etree.HTMLParser())
+
+
+def test_diff_trees_reports_smallest_changed_subtrees():
+    old = _tree()
+    assert diff_trees(old, _tree()) == {}
+
+    new = _tree(count=2, items=('a', 'b'), footer='highlighted')
+    changes = diff_trees(old, new)
+    assert list(changes) == [
+        Locator(By.XPATH, '/html/body/div[2]/span'),
+        Locator(By.XPATH, '/html/body/div[2]/ul'),
+        Locator(By.XPATH, '/html/body/div[3]'),
+    ]
+    assert changes[Locator(By.XPATH, '/html/body/div[2]/span')].text == '2'
+    assert [li.text for li in changes[Locator(By.XPATH, '/html/body/div[2]/ul')]] == ['a', 'b']
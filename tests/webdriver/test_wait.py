@@ -0,0 +1,43 @@
+from unittest.mock import MagicMock, patch
+
+from pytest import raises
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+
+from slimleaf.webdriver import wait
+from slimleaf.webdriver.wait import PollSchedule, SmartWait, WAIT_STATS
+
+
+def test_poll_schedule_backs_off_to_maximum():
+    intervals = PollSchedule(initial=0.025, factor=2, maximum=0.5).intervals()
+    assert [next(intervals) for _ in range(7)] == [0.025, 0.05, 0.1, 0.2, 0.4, 0.5, 0.5]
+
+
+@patch('slimleaf.webdriver.wait.time.sleep')
+def test_smart_wait_polls_on_schedule_and_records_stats(_mock_sleep):
+    WAIT_STATS.reset()
+    condition = MagicMock(side_effect=[NoSuchElementException, False, 'found'])
+
+    assert SmartWait(MagicMock(), 5, site='test.site').until(condition) == 'found'
+    assert [c[0][0] for c in _mock_sleep.call_args_list] == [0.025, 0.05]
+
+    stats = WAIT_STATS.snapshot()['test.site']
+    assert (stats['waits'], stats['polls'], stats['timeouts']) == (1, 3, 0)
+
+
+def test_smart_wait_times_out():
+    WAIT_STATS.reset()
+    schedule = PollSchedule(initial=0.001, factor=1, maximum=0.001)
+
+    with raises(TimeoutException):
+        SmartWait(MagicMock(), 0.01, site='test.timeout', schedule=schedule).until(lambda d: False)
+    assert WAIT_STATS.snapshot()['test.timeout']['timeouts'] == 1
+
+
+def test_default_schedule_is_configurable():
+    schedule = PollSchedule(initial=0.1, factor=1, maximum=0.1)
+    wait.set_default_schedule(schedule)
+    try:
+        assert SmartWait(MagicMock(), 1).schedule == schedule
+    finally:
+        wait.set_default_schedule(None)
+    assert SmartWait(MagicMock(), 1).schedule == wait.DEFAULT_SCHEDULE